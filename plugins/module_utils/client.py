@@ -7,7 +7,12 @@
 
 from __future__ import annotations
 
+import fcntl
+import hashlib
+import json
 import logging
+import os
+import time
 
 from ansible.module_utils.basic import missing_required_lib
 
@@ -75,17 +80,27 @@ def get_scm_client(module):
     return None
 
 
-def handle_scm_error(module, error):
+def handle_scm_error(module, error, msg=None, **extra):
     """Handle SCM API errors and translate them to Ansible module failures.
 
+    The SDK error code and details carried by ``error``, if any, are returned
+    alongside the message.
+
     Args:
         module: Ansible module object
         error: Exception raised by SCM API call
+        msg: Failure message, defaults to ``str(error)``
+        **extra: Additional keys for the failure result
 
     Returns:
         None
     """
-    module.fail_json(msg=str(error))
+    module.fail_json(
+        msg=str(error) if msg is None else msg,
+        error_code=getattr(error, "error_code", None),
+        details=getattr(error, "details", None),
+        **extra,
+    )
 
 
 def get_oauth2_token(
@@ -157,6 +172,92 @@ def get_oauth2_token(
         raise APIError(f"Failed to obtain OAuth2 token: {exc}")
 
 
+# Seconds before expiry at which a cached token is treated as stale
+TOKEN_REFRESH_MARGIN = 60
+
+
+def _read_token_cache(cache_path: str) -> dict | None:
+    """Read the token cache file, returning None if it is missing or unreadable."""
+    try:
+        with open(cache_path, encoding="utf-8") as cache_file:
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+
+
+def _cached_token(cached: dict | None, fingerprint: str) -> dict | None:
+    """Return the cached token if it belongs to ``fingerprint`` and is not about to expire."""
+    if not cached or cached.get("fingerprint") != fingerprint:
+        return None
+    if cached.get("expires_at", 0) - TOKEN_REFRESH_MARGIN <= time.time():
+        return None
+    return cached.get("token")
+
+
+def get_cached_oauth2_token(
+    cache_path: str,
+    client_id: str,
+    client_secret: str,
+    tsg_id: str,
+    scopes: list | None = None,
+    log_level: str = "ERROR",
+) -> dict:
+    """Obtain an OAuth2 token through an on-disk cache shared by concurrent forks.
+
+    A refresh holds an exclusive ``fcntl.flock`` on ``<cache_path>.lock``. Forks
+    waiting on the lock re-read the cache once they acquire it, so only the first
+    fork requests a new token and the others reuse the one it wrote.
+
+    Args:
+        cache_path: Path of the JSON token cache file (written with mode 0600)
+        client_id: OAuth2 client ID
+        client_secret: OAuth2 client secret
+        tsg_id: Tenant Service Group ID
+        scopes: Optional list of scopes
+        log_level: SDK log level
+
+    Returns:
+        dict: Token information in the format returned by get_oauth2_token()
+
+    Raises:
+        APIError: On authentication failure or SDK errors.
+    """
+    scope = " ".join(str(s) for s in scopes) if scopes else ""
+    fingerprint = hashlib.sha256(f"{client_id}:{client_secret}:{tsg_id}:{scope}".encode()).hexdigest()
+
+    token = _cached_token(_read_token_cache(cache_path), fingerprint)
+    if token:
+        return token
+
+    lock_fd = os.open(f"{cache_path}.lock", os.O_CREAT | os.O_RDWR, 0o600)
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+
+        # Another fork may have refreshed the token while we waited for the lock
+        token = _cached_token(_read_token_cache(cache_path), fingerprint)
+        if token:
+            return token
+
+        token = get_oauth2_token(
+            client_id=client_id,
+            client_secret=client_secret,
+            tsg_id=tsg_id,
+            scopes=scopes,
+            log_level=log_level,
+        )
+        expires_at = token["raw"].get("expires_at") or time.time() + (token.get("expires_in") or 0)
+
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        tmp_fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(tmp_fd, "w", encoding="utf-8") as tmp_file:
+            json.dump({"fingerprint": fingerprint, "expires_at": expires_at, "token": token}, tmp_file)
+        os.replace(tmp_path, cache_path)
+        return token
+    finally:
+        fcntl.flock(lock_fd, fcntl.LOCK_UN)
+        os.close(lock_fd)
+
+
 def is_resource_exists(client, resource_type, resource_id=None, resource_name=None):
     """Check if a resource exists in SCM by ID or name.
 
@@ -0,0 +1,153 @@
+# Copyright: (c) 2025, Calvin Remsburg (@cdot65) <dev@cdot.io>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Connection helpers shared by Strata Cloud Manager modules."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+
+DEFAULT_API_URL = "https://api.strata.paloaltonetworks.com"
+
+# Responses that are safe to retry for idempotent requests
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Keep-alive connections held per host; covers the 8-worker lookup pools
+POOL_MAXSIZE = 10
+
+# SCM clients keyed by (api_url, token fingerprint), least recently used first
+CLIENT_CACHE_SIZE = 8
+_CLIENT_CACHE: OrderedDict = OrderedDict()
+
+# Recent read responses shared by modules running in the same process
+RESPONSE_CACHE_TTL = 30
+_RESPONSE_CACHE: dict[tuple, tuple[float, object]] = {}
+
+
+@functools.lru_cache(maxsize=16)
+def validate_api_url(url: str) -> str:
+    """Validate and normalize an SCM API URL once per process.
+
+    The host is lower-cased and any trailing slash is dropped, so equivalent
+    spellings such as ``https://HOST/`` and ``https://host`` share one client.
+
+    Args:
+        url: URL taken from module parameters
+
+    Returns:
+        str: The normalized URL
+
+    Raises:
+        ValueError: If the URL is not an absolute https URL
+    """
+    parts = urlsplit(url)
+    if parts.scheme.lower() != "https" or not parts.hostname:
+        raise ValueError(f"Invalid API URL '{url}': an absolute https URL is required")
+    return urlunsplit(("https", parts.netloc.lower(), parts.path.rstrip("/"), parts.query, ""))
+
+
+def configure_session(session):
+    """Mount a pooled keep-alive HTTPS adapter that retries transient failures.
+
+    Up to ``POOL_MAXSIZE`` connections are kept alive, so concurrent lookups
+    and repeated calls reuse TLS sessions instead of reconnecting. Idempotent
+    requests answered with a status in ``RETRY_STATUS_CODES`` are retried with
+    jittered exponential backoff, honouring any ``Retry-After`` header, so
+    parallel forks do not retry in lock-step.
+
+    Args:
+        session: requests.Session used by the SCM client
+
+    Returns:
+        requests.Session: The same session, for chaining
+    """
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry_kwargs = dict(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUS_CODES,
+        respect_retry_after_header=True,
+        # Hand the final error response back so the SDK can raise its own exception
+        raise_on_status=False,
+    )
+    try:
+        retries = Retry(backoff_jitter=0.3, **retry_kwargs)
+    except TypeError:
+        # urllib3 < 2.0 has no backoff_jitter
+        retries = Retry(**retry_kwargs)
+    adapter = HTTPAdapter(pool_connections=POOL_MAXSIZE, pool_maxsize=POOL_MAXSIZE, max_retries=retries)
+    session.mount("https://", adapter)
+    return session
+
+
+def token_fingerprint(token: str) -> str:
+    """Return a short SHA-256 fingerprint of ``token`` for use in cache keys.
+
+    Deliberately not memoized: a memo would keep the raw token in process
+    memory as its key, and hashing a token is cheap enough to repeat.
+
+    Args:
+        token: OAuth2 access token
+
+    Returns:
+        str: First 16 hex digits of the token's SHA-256 digest
+    """
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def get_cached_client(api_url: str, access_token: str):
+    """Return an SCM client for ``access_token``, reusing one built earlier in this process.
+
+    Clients live in a small LRU keyed by URL and token fingerprint, so the secret
+    itself is never part of a cache key and a reused client keeps its session.
+
+    Args:
+        api_url: Validated SCM API base URL
+        access_token: OAuth2 access token
+
+    Returns:
+        Scm: SCM client with a configured session
+    """
+    key = (api_url, token_fingerprint(access_token))
+    client = _CLIENT_CACHE.get(key)
+    if client is not None:
+        _CLIENT_CACHE.move_to_end(key)
+        return client
+
+    from scm.client import Scm
+
+    client = Scm(api_base_url=api_url, access_token=access_token)
+    configure_session(client.session)
+    _CLIENT_CACHE[key] = client
+    if len(_CLIENT_CACHE) > CLIENT_CACHE_SIZE:
+        _CLIENT_CACHE.popitem(last=False)
+    return client
+
+
+def cached_read(key: tuple, fetch):
+    """Return ``fetch()``, reusing a result cached under ``key`` within the last ``RESPONSE_CACHE_TTL`` seconds.
+
+    Args:
+        key: Cache key, normally (resource, api_url, token fingerprint)
+        fetch: Zero-argument callable performing the read
+
+    Returns:
+        The fresh or cached result of ``fetch()``
+    """
+    ts, value = _RESPONSE_CACHE.get(key, (0, None))
+    if value is not None and time.monotonic() - ts < RESPONSE_CACHE_TTL:
+        return value
+    value = fetch()
+    _RESPONSE_CACHE[key] = (time.monotonic(), value)
+    return value
+
+
+def invalidate_read(key: tuple) -> None:
+    """Drop the cached read for ``key`` after the resource has been changed."""
+    _RESPONSE_CACHE.pop(key, None)
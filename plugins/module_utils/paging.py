@@ -0,0 +1,77 @@
+# Copyright: (c) 2025, Calvin Remsburg (@cdot65) <dev@cdot.io>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Paged listing helpers shared by Strata Cloud Manager modules."""
+
+from __future__ import annotations
+
+
+def _invalid_response(message: str, details: dict):
+    """Build the InvalidObjectError the SDK's list() methods raise for a malformed response."""
+    from scm.exceptions import InvalidObjectError
+
+    return InvalidObjectError(message=message, error_code="E003", http_status_code=500, details=details)
+
+
+def page_records(response, single_object: bool = False) -> list:
+    """Return the records of one list response, checked the way the SDK's ``list()`` methods check them.
+
+    Args:
+        response: Decoded JSON body of a list request
+        single_object: Accept a lone object (a dictionary with an ``id`` and
+            no ``data``), which some endpoints return when a filter matches
+            exactly one record
+
+    Returns:
+        list: Raw records of the page
+
+    Raises:
+        InvalidObjectError: If the response is not a dictionary with a ``data`` list
+    """
+    if not isinstance(response, dict):
+        raise _invalid_response(
+            "Invalid response format: expected dictionary",
+            {"error": "Response is not a dictionary"},
+        )
+    if "data" not in response:
+        if single_object and "id" in response:
+            return [response]
+        raise _invalid_response(
+            "Invalid response format: missing 'data' field",
+            {"field": "data", "error": '"data" field missing in the response'},
+        )
+    records = response["data"]
+    if not isinstance(records, list):
+        raise _invalid_response(
+            "Invalid response format: 'data' field must be a list",
+            {"field": "data", "error": '"data" field must be a list'},
+        )
+    return records
+
+
+def iter_pages(client, service, params: dict):
+    """Yield the raw records of a listing one API page at a time.
+
+    Pages and validates responses the way the SDK's ``list()`` methods do,
+    but hands back each page as it arrives, so callers can convert and
+    discard records without building every page into models first.
+
+    Args:
+        client: SCM client
+        service: SDK service providing ``ENDPOINT`` and ``max_limit``
+        params: Query parameters, e.g. {"folder": "Texas"}
+
+    Yields:
+        list: Raw records of one page
+
+    Raises:
+        InvalidObjectError: If a response is not a dictionary with a ``data`` list
+    """
+    page_size = service.max_limit
+    offset = 0
+    while True:
+        page = page_records(client.get(service.ENDPOINT, params={**params, "limit": page_size, "offset": offset}))
+        yield page
+        if len(page) < page_size:
+            break
+        offset += page_size
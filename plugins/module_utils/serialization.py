@@ -0,0 +1,42 @@
+# Copyright: (c) 2025, Calvin Remsburg (@cdot65) <dev@cdot.io>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Result serialization helpers for Strata Cloud Manager modules."""
+
+from __future__ import annotations
+
+HAS_ORJSON = False
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+
+
+def use_fast_json(module):
+    """Serialize the module result with orjson when it is installed.
+
+    Replaces ``module.jsonify``, which AnsibleModule calls after no_log values
+    have been scrubbed from the result. Payloads orjson cannot encode fall back
+    to the stock Ansible serializer.
+
+    Args:
+        module: Ansible module object
+
+    Returns:
+        AnsibleModule: The same module, for chaining
+    """
+    if not HAS_ORJSON:
+        return module
+
+    default_jsonify = module.jsonify
+
+    def jsonify(data):
+        try:
+            return orjson.dumps(data).decode("utf-8")
+        except TypeError:
+            return default_jsonify(data)
+
+    module.jsonify = jsonify
+    return module
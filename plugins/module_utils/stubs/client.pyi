@@ -2,6 +2,8 @@
 
 from typing import Any
 
+TOKEN_REFRESH_MARGIN: int
+
 def get_scm_client_argument_spec() -> dict[str, dict[str, Any]]: ...
 def get_scm_client(module: Any) -> Any: ...
 def handle_scm_error(module: Any, error: Exception) -> None: ...
@@ -12,6 +14,14 @@ def get_oauth2_token(
     scopes: list[str] | None = None,
     log_level: str = "ERROR",
 ) -> dict[str, Any]: ...
+def get_cached_oauth2_token(
+    cache_path: str,
+    client_id: str,
+    client_secret: str,
+    tsg_id: str,
+    scopes: list[str] | None = None,
+    log_level: str = "ERROR",
+) -> dict[str, Any]: ...
 def is_resource_exists(
     client: Any, resource_type: str, resource_id: str | None = None, resource_name: str | None = None
 ) -> tuple[bool, dict[str, Any] | None]: ...
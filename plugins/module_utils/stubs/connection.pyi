@@ -0,0 +1,17 @@
+"""Type stubs for connection.py module."""
+
+from collections.abc import Callable
+from typing import Any
+
+DEFAULT_API_URL: str
+RETRY_STATUS_CODES: tuple[int, ...]
+POOL_MAXSIZE: int
+CLIENT_CACHE_SIZE: int
+RESPONSE_CACHE_TTL: int
+
+def validate_api_url(url: str) -> str: ...
+def configure_session(session: Any) -> Any: ...
+def token_fingerprint(token: str) -> str: ...
+def get_cached_client(api_url: str, access_token: str) -> Any: ...
+def cached_read(key: tuple[Any, ...], fetch: Callable[[], Any]) -> Any: ...
+def invalidate_read(key: tuple[Any, ...]) -> None: ...
@@ -0,0 +1,7 @@
+"""Type stubs for serialization.py module."""
+
+from typing import Any
+
+HAS_ORJSON: bool
+
+def use_fast_json(module: Any) -> Any: ...
@@ -41,6 +41,14 @@ options:
         required: false
         default: "ERROR"
         choices: ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+    token_cache_path:
+        description:
+            - Path of a file used to cache the access token between tasks and forks.
+            - When set, the token is reused until shortly before it expires, and concurrent forks
+              share a single token request through an exclusive lock on C(<token_cache_path>.lock).
+            - The cache file is created with mode C(0600) and contains the access token.
+        type: path
+        required: false
 requirements:
     - scm
 """
@@ -90,27 +98,33 @@ scope:
 """
 
 
-def main():
-    module_args = dict(
-        client_id=dict(type="str", required=True, no_log=True),
-        client_secret=dict(type="str", required=True, no_log=True),
-        tsg_id=dict(type="str", required=True),
-        scopes=dict(type="list", elements="str", required=False, default=None),
-        log_level=dict(type="str", required=False, default="ERROR"),
-    )
+_MODULE_ARGS = dict(
+    client_id=dict(type="str", required=True, no_log=True),
+    client_secret=dict(type="str", required=True, no_log=True),
+    tsg_id=dict(type="str", required=True),
+    scopes=dict(type="list", elements="str", required=False, default=None),
+    log_level=dict(type="str", required=False, default="ERROR"),
+    token_cache_path=dict(type="path", required=False),
+)
 
-    module = AnsibleModule(argument_spec=module_args, supports_check_mode=True)
+
+def main():
+    module = AnsibleModule(argument_spec=_MODULE_ARGS, supports_check_mode=True)
 
     result = dict(changed=False)
 
     try:
-        token_info = scm_client_utils.get_oauth2_token(
+        token_kwargs = dict(
             client_id=module.params["client_id"],
             client_secret=module.params["client_secret"],
             tsg_id=module.params["tsg_id"],
             scopes=module.params["scopes"],
             log_level=module.params["log_level"],
         )
+        if module.params["token_cache_path"]:
+            token_info = scm_client_utils.get_cached_oauth2_token(module.params["token_cache_path"], **token_kwargs)
+        else:
+            token_info = scm_client_utils.get_oauth2_token(**token_kwargs)
         result.update(token_info)
     except Exception as e:
         module.fail_json(msg=str(e), **result)
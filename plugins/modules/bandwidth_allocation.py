@@ -87,53 +87,108 @@ msg:
   type: str
 """
 
+import operator
+import time
+
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.cdot65.scm.plugins.module_utils.connection import (
+    DEFAULT_API_URL,
+    get_cached_client,
+    token_fingerprint,
+    validate_api_url,
+)
+from ansible_collections.cdot65.scm.plugins.module_utils.paging import iter_pages
+from ansible_collections.cdot65.scm.plugins.module_utils.serialization import use_fast_json
+
+# Complete allocation listings keyed by (api_url, token fingerprint) so repeated
+# tasks in the same worker process reuse one listing.
+_LIST_CACHE: dict[tuple, tuple[float, list]] = {}
+_LIST_CACHE_TTL = 30
+
+_dump = operator.methodcaller("model_dump", exclude_unset=True, mode="json")
+
+_MODULE_ARGS = dict(
+    name=dict(type="str", required=True),
+    allocated_bandwidth=dict(type="float", required=False),
+    spn_name_list=dict(type="list", elements="str", required=False),
+    qos=dict(type="dict", required=False),
+    api_url=dict(type="str", default=DEFAULT_API_URL),
+    scm_access_token=dict(type="str", required=True, no_log=True),
+    state=dict(type="str", choices=["present", "absent"], default="present"),
+)
+
+
+def _iter_allocations(client):
+    """Yield allocations one page at a time so callers can stop at the first match."""
+    from scm.models.deployment import BandwidthAllocationResponseModel
+
+    for page in iter_pages(client, client.bandwidth_allocation, {}):
+        yield from map(BandwidthAllocationResponseModel.model_validate, page)
+
+
+def _spns_differ(desired, current):
+    """Return whether requested SPNs differ from the allocation's, ignoring order and duplicates.
 
-try:
-    from scm.client import Scm as ScmClient
-    from scm.exceptions import APIError, ObjectNotPresentError
+    An empty request means the SPNs are not being managed, so it never differs.
+    """
+    return bool(desired) and frozenset(desired) != frozenset(current or ())
 
-    HAS_SCM_SDK = True
-except ImportError:
-    HAS_SCM_SDK = False
+
+def _find_allocation(client, key, name):
+    """Return the allocation called ``name``, or None if it does not exist.
+
+    A fresh cached listing is scanned when available. Otherwise pages are
+    streamed until a match is found, and a listing read to the end is cached.
+    """
+    ts, data = _LIST_CACHE.get(key, (0, None))
+    if data is not None and time.monotonic() - ts < _LIST_CACHE_TTL:
+        return next((alloc for alloc in data if alloc.name == name), None)
+    seen = []
+    for alloc in _iter_allocations(client):
+        if alloc.name == name:
+            return alloc
+        seen.append(alloc)
+    _LIST_CACHE[key] = (time.monotonic(), seen)
+    return None
 
 
 def main():
-    module_args = dict(
-        name=dict(type="str", required=True),
-        allocated_bandwidth=dict(type="float", required=False),
-        spn_name_list=dict(type="list", elements="str", required=False),
-        qos=dict(type="dict", required=False),
-        api_url=dict(type="str", default="https://api.strata.paloaltonetworks.com"),
-        scm_access_token=dict(type="str", required=True, no_log=True),
-        state=dict(type="str", choices=["present", "absent"], default="present"),
-    )
-
-    module = AnsibleModule(argument_spec=module_args, supports_check_mode=True)
-
-    if not HAS_SCM_SDK:
+    module = AnsibleModule(argument_spec=_MODULE_ARGS, supports_check_mode=True)
+    use_fast_json(module)
+
+    try:
+        from scm.exceptions import APIError, ObjectNotPresentError
+    except ImportError:
         module.fail_json(msg="pan-scm-sdk required")
 
     params = module.params
     name = params["name"]
     state = params["state"]
+    spn = params.get("spn_name_list")
+    qos = params.get("qos")
+    alloc_bw = params.get("allocated_bandwidth")
 
     try:
-        client = ScmClient(
-            api_base_url=params.get("api_url") or "https://api.strata.paloaltonetworks.com",
-            access_token=params["scm_access_token"],
-        )
+        api_url = validate_api_url(params.get("api_url") or DEFAULT_API_URL)
+    except ValueError as e:
+        module.fail_json(msg=str(e))
+
+    try:
+        client = get_cached_client(api_url, params["scm_access_token"])
     except Exception as e:
         module.fail_json(msg=f"Failed to initialize client: {str(e)}")
 
+    cache_key = (api_url, token_fingerprint(params["scm_access_token"]))
+
     result = {"changed": False, "msg": ""}
 
     try:
         if state == "absent":
-            if params.get("spn_name_list"):
-                spn_str = ",".join(params["spn_name_list"])
+            if spn:
+                spn_str = ",".join(spn)
                 try:
                     client.bandwidth_allocation.delete(name, spn_str)
+                    _LIST_CACHE.pop(cache_key, None)
                     result["changed"] = True
                     result["msg"] = f"Bandwidth allocation '{name}' deleted"
                 except (ObjectNotPresentError, APIError):
@@ -143,24 +198,25 @@ def main():
             module.exit_json(**result)
 
         # Create or update
-        if not params.get("allocated_bandwidth"):
+        if not alloc_bw:
             module.fail_json(msg="allocated_bandwidth required for state=present")
 
-        data = {"name": name, "allocated_bandwidth": params["allocated_bandwidth"]}
-
-        if params.get("spn_name_list"):
-            data["spn_name_list"] = params["spn_name_list"]
-        if params.get("qos"):
-            data["qos"] = params["qos"]
+        # Optional fields are only sent when set, matching the previous truthiness checks
+        data = {
+            key: value
+            for key, value in (
+                ("name", name),
+                ("allocated_bandwidth", alloc_bw),
+                ("spn_name_list", spn),
+                ("qos", qos),
+            )
+            if value
+        }
 
         # Check if exists
         existing = None
         try:
-            all_allocations = client.bandwidth_allocation.list()
-            for alloc in all_allocations:
-                if alloc.name == name:
-                    existing = alloc
-                    break
+            existing = _find_allocation(client, cache_key, name)
         except Exception as e:
             # If listing fails, proceed with create (will fail with better error)
             module.warn(f"Unable to check existing allocations: {str(e)}")
@@ -168,25 +224,27 @@ def main():
         if existing:
             # Update if changed
             needs_update = False
-            if abs(existing.allocated_bandwidth - params["allocated_bandwidth"]) > 0.01:
+            if abs(existing.allocated_bandwidth - alloc_bw) > 0.01:
                 needs_update = True
-            if params.get("spn_name_list") and set(params.get("spn_name_list", [])) != set(existing.spn_name_list or []):
+            if _spns_differ(spn, existing.spn_name_list):
                 needs_update = True
 
             if needs_update:
                 updated = client.bandwidth_allocation.update(data)
+                _LIST_CACHE.pop(cache_key, None)
                 result["changed"] = True
                 result["msg"] = f"Bandwidth allocation '{name}' updated"
-                result["allocation"] = updated.model_dump(exclude_unset=True)
+                result["allocation"] = _dump(updated)
             else:
                 result["msg"] = f"Bandwidth allocation '{name}' unchanged"
-                result["allocation"] = existing.model_dump(exclude_unset=True)
+                result["allocation"] = _dump(existing)
         else:
             # Create
             created = client.bandwidth_allocation.create(data)
+            _LIST_CACHE.pop(cache_key, None)
             result["changed"] = True
             result["msg"] = f"Bandwidth allocation '{name}' created"
-            result["allocation"] = created.model_dump(exclude_unset=True)
+            result["allocation"] = _dump(created)
 
     except APIError as e:
         module.fail_json(msg=f"API error: {str(e)}")
@@ -17,6 +17,14 @@ options:
     description: Name of the aggregated bandwidth region to retrieve
     required: false
     type: str
+  names:
+    description:
+      - Names of aggregated bandwidth regions to retrieve.
+      - Lookups are issued concurrently, up to 8 at a time.
+      - Mutually exclusive with I(name).
+    required: false
+    type: list
+    elements: str
   api_url:
     description: SCM API base URL
     required: false
@@ -38,6 +46,13 @@ EXAMPLES = r"""
   cdot65.scm.bandwidth_allocation_info:
     name: "region-us-east"
     scm_access_token: "{{ scm_access_token }}"
+
+- name: Get several bandwidth allocations
+  cdot65.scm.bandwidth_allocation_info:
+    names:
+      - "region-us-east"
+      - "region-us-west"
+    scm_access_token: "{{ scm_access_token }}"
 """
 
 RETURN = r"""
@@ -57,55 +72,70 @@ allocations:
         profile: "default"
 """
 
+import operator
+from concurrent.futures import ThreadPoolExecutor
+
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.cdot65.scm.plugins.module_utils.connection import DEFAULT_API_URL, get_cached_client, validate_api_url
+from ansible_collections.cdot65.scm.plugins.module_utils.serialization import use_fast_json
 
-try:
-    from scm.client import Scm as ScmClient
-    from scm.exceptions import APIError
+_dump = operator.methodcaller("model_dump", exclude_unset=True, mode="json")
 
-    HAS_SCM_SDK = True
-except ImportError:
-    HAS_SCM_SDK = False
+_MODULE_ARGS = dict(
+    name=dict(type="str", required=False),
+    names=dict(type="list", elements="str", required=False),
+    api_url=dict(type="str", default=DEFAULT_API_URL),
+    scm_access_token=dict(type="str", required=True, no_log=True),
+)
 
 
 def main():
-    module_args = dict(
-        name=dict(type="str", required=False),
-        api_url=dict(type="str", default="https://api.strata.paloaltonetworks.com"),
-        scm_access_token=dict(type="str", required=True, no_log=True),
+    module = AnsibleModule(
+        argument_spec=_MODULE_ARGS,
+        mutually_exclusive=[["name", "names"]],
+        supports_check_mode=True,
     )
+    use_fast_json(module)
 
-    module = AnsibleModule(argument_spec=module_args, supports_check_mode=True)
-
-    if not HAS_SCM_SDK:
+    try:
+        from scm.exceptions import APIError
+    except ImportError:
         module.fail_json(msg="pan-scm-sdk required")
 
     params = module.params
     name = params.get("name")
+    names = params.get("names")
+
+    try:
+        api_url = validate_api_url(params.get("api_url") or DEFAULT_API_URL)
+    except ValueError as e:
+        module.fail_json(msg=str(e))
 
     try:
-        client = ScmClient(
-            api_base_url=params.get("api_url") or "https://api.strata.paloaltonetworks.com",
-            access_token=params["scm_access_token"],
-        )
+        client = get_cached_client(api_url, params["scm_access_token"])
     except Exception as e:
         module.fail_json(msg=f"Failed to initialize client: {str(e)}")
 
     result = {"changed": False, "allocations": []}
 
     try:
-        if name:
+        if names:
+            # Fetch each requested allocation concurrently, preserving the requested order
+            service = client.bandwidth_allocation
+            with ThreadPoolExecutor(max_workers=min(8, len(names))) as executor:
+                result["allocations"] = [
+                    _dump(alloc)
+                    for requested, alloc in zip(names, executor.map(service.get, names))
+                    if alloc is not None and alloc.name == requested
+                ]
+        elif name:
             # Get specific allocation
             all_allocations = client.bandwidth_allocation.list()
-            for alloc in all_allocations:
-                if alloc.name == name:
-                    result["allocations"].append(alloc.model_dump(exclude_unset=True))
-                    break
+            match = next((alloc for alloc in all_allocations if alloc.name == name), None)
+            result["allocations"] = [] if match is None else [_dump(match)]
         else:
             # List all allocations
-            allocations = client.bandwidth_allocation.list()
-            for alloc in allocations:
-                result["allocations"].append(alloc.model_dump(exclude_unset=True))
+            result["allocations"] = list(map(_dump, client.bandwidth_allocation.list()))
 
     except APIError as e:
         module.fail_json(msg=f"API error: {str(e)}")
@@ -3,11 +3,16 @@
 # Copyright: (c) 2025, Calvin Remsburg (@cdot65) <dev@cdot.io>
 # GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
-import json
-
 from ansible.module_utils.basic import AnsibleModule
-from scm.client import ScmClient
-from scm.exceptions import APIError, InvalidObjectError
+from ansible_collections.cdot65.scm.plugins.module_utils.client import handle_scm_error
+from ansible_collections.cdot65.scm.plugins.module_utils.connection import (
+    DEFAULT_API_URL,
+    cached_read,
+    get_cached_client,
+    invalidate_read,
+    token_fingerprint,
+    validate_api_url,
+)
 
 DOCUMENTATION = r"""
 ---
@@ -92,6 +97,9 @@ notes:
     - BGP routing is a singleton object - there is only one configuration per SCM instance.
     - This configuration does not belong to a folder, snippet, or device container.
     - When state=reset, the configuration is restored to default values, not deleted.
+    - "Because the configuration is shared by the whole tenant, run this module once per play (for example with
+      C(run_once: true)) rather than once per inventory host; per-host runs repeat the same API calls against
+      the same object."
 """
 
 EXAMPLES = r"""
@@ -132,6 +140,13 @@ EXAMPLES = r"""
     scm_access_token: "{{ scm_access_token }}"
     state: present
 
+- name: Configure BGP routing once for the whole tenant
+  cdot65.scm.bgp_routing:
+    backbone_routing: "no-asymmetric-routing"
+    scm_access_token: "{{ scm_access_token }}"
+    state: present
+  run_once: true
+
 - name: Reset BGP routing to defaults
   cdot65.scm.bgp_routing:
     scm_access_token: "{{ scm_access_token }}"
@@ -182,65 +197,135 @@ bgp_routing:
 """
 
 
-def main():
-    module_args = dict(
-        routing_preference=dict(
-            type="str",
-            required=False,
-            choices=["default", "hot_potato_routing"],
-        ),
-        backbone_routing=dict(
-            type="str",
-            required=False,
-            choices=[
-                "no-asymmetric-routing",
-                "asymmetric-routing-only",
-                "asymmetric-routing-with-load-share",
-            ],
-        ),
-        accept_route_over_sc=dict(type="bool", required=False, default=False),
-        outbound_routes_for_services=dict(
-            type="list",
-            elements="str",
-            required=False,
-            default=[],
-        ),
-        add_host_route_to_ike_peer=dict(type="bool", required=False, default=False),
-        withdraw_static_route=dict(type="bool", required=False, default=False),
-        scm_access_token=dict(type="str", required=True, no_log=True),
-        api_url=dict(type="str", required=False),
-        state=dict(type="str", required=False, choices=["present", "reset"], default="present"),
+_ROUTING_PREF_CHOICES = ("default", "hot_potato_routing")
+_BACKBONE_CHOICES = (
+    "no-asymmetric-routing",
+    "asymmetric-routing-only",
+    "asymmetric-routing-with-load-share",
+)
+
+# Update payload for each routing_preference choice
+_ROUTING_PREF_PAYLOAD = {choice: {choice: {}} for choice in _ROUTING_PREF_CHOICES}
+
+# (API field, module parameter) pairs copied into the update payload as-is
+_FIELD_MAP = (
+    ("accept_route_over_SC", "accept_route_over_sc"),
+    ("outbound_routes_for_services", "outbound_routes_for_services"),
+    ("add_host_route_to_ike_peer", "add_host_route_to_ike_peer"),
+    ("withdraw_static_route", "withdraw_static_route"),
+)
+
+_MODULE_ARGS = dict(
+    routing_preference=dict(
+        type="str",
+        required=False,
+        choices=_ROUTING_PREF_CHOICES,
+    ),
+    backbone_routing=dict(
+        type="str",
+        required=False,
+        choices=_BACKBONE_CHOICES,
+    ),
+    accept_route_over_sc=dict(type="bool", required=False, default=False),
+    outbound_routes_for_services=dict(
+        type="list",
+        elements="str",
+        required=False,
+        default=[],
+    ),
+    add_host_route_to_ike_peer=dict(type="bool", required=False, default=False),
+    withdraw_static_route=dict(type="bool", required=False, default=False),
+    scm_access_token=dict(type="str", required=True, no_log=True),
+    api_url=dict(type="str", required=False),
+    state=dict(type="str", required=False, choices=["present", "reset"], default="present"),
+)
+
+_REQUIRED_IF = [
+    ["state", "present", ["backbone_routing"]],
+]
+
+
+def _default_bgp_routing():
+    """Return a fresh copy of the document client.bgp_routing.delete() writes when resetting to defaults."""
+    return {
+        "routing_preference": {"default": {}},
+        "backbone_routing": "no-asymmetric-routing",
+        "accept_route_over_SC": False,
+        "outbound_routes_for_services": [],
+        "add_host_route_to_ike_peer": False,
+        "withdraw_static_route": False,
+    }
+
+
+def _field_differs(current_config, api_field, new_value):
+    """Return True if ``api_field`` of the current configuration differs from ``new_value``."""
+    current_value = getattr(current_config, api_field, None)
+    if isinstance(new_value, list):
+        # Route order is irrelevant, so compare as sets
+        return frozenset(current_value or ()) != frozenset(new_value)
+    return current_value != new_value
+
+
+def _needs_update(current_config, update_fields):
+    """Return True as soon as any field in ``update_fields`` differs from the current configuration."""
+    if "routing_preference" in update_fields:
+        current_pref = current_config.routing_preference
+        # The SDK's routing preference model carries an attribute named after the active choice
+        current_pref_type = next((attr for attr in _ROUTING_PREF_CHOICES if hasattr(current_pref, attr)), None)
+
+        if next(iter(update_fields["routing_preference"])) != current_pref_type:
+            return True
+
+    if "backbone_routing" in update_fields:
+        # The SDK returns an enum; str() of it is the member name, not the API value
+        current_backbone = getattr(current_config.backbone_routing, "value", current_config.backbone_routing)
+        if current_backbone != update_fields["backbone_routing"]:
+            return True
+
+    return any(
+        _field_differs(current_config, api_field, update_fields[api_field])
+        for api_field, _param_field in _FIELD_MAP
+        if api_field in update_fields
     )
 
+
+def main():
     # Initialize module
     module = AnsibleModule(
-        argument_spec=module_args,
-        required_if=[
-            ["state", "present", ["backbone_routing"]],
-        ],
+        argument_spec=_MODULE_ARGS,
+        required_if=_REQUIRED_IF,
         supports_check_mode=True,
     )
 
+    try:
+        from scm.exceptions import APIError, InvalidObjectError
+    except ImportError:
+        module.fail_json(msg="pan-scm-sdk required")
+
     # Get parameters
     params = module.params
 
+    try:
+        api_url = validate_api_url(params.get("api_url") or DEFAULT_API_URL)
+    except ValueError as e:
+        module.fail_json(msg=str(e))
+
     # Initialize results
     result = {"changed": False, "bgp_routing": None}
 
     # Perform operations
     try:
-        # Initialize SCM client
-        client = ScmClient(access_token=params.get("scm_access_token"))
+        # Initialize SCM client, reusing one already built for this token in this process
+        client = get_cached_client(api_url, params.get("scm_access_token"))
+        cache_key = ("bgp_routing", api_url, token_fingerprint(params.get("scm_access_token")))
 
-        # Get current BGP routing configuration
+        # Get current BGP routing configuration. This read is needed even when every field is
+        # supplied: update() echoes the payload back, so only the prior state can tell whether
+        # anything changed. cached_read() skips it when a recent read is still fresh.
         try:
-            current_config = client.bgp_routing.get()
+            current_config = cached_read(cache_key, client.bgp_routing.get)
         except Exception as e:
-            module.fail_json(
-                msg=f"Error retrieving current BGP routing configuration: {str(e)}",
-                error_code=getattr(e, "error_code", None),
-                details=getattr(e, "details", None),
-            )
+            handle_scm_error(module, e, f"Error retrieving current BGP routing configuration: {str(e)}")
 
         # Handle reset state - restore defaults
         if params.get("state") == "reset":
@@ -257,136 +342,76 @@ def main():
                 if not module.check_mode:
                     try:
                         client.bgp_routing.delete()
-                        # Get the updated configuration after reset
-                        updated_config = client.bgp_routing.get()
-                        result["bgp_routing"] = json.loads(updated_config.model_dump_json(exclude_unset=True))
+                        invalidate_read(cache_key)
+                        # delete() PUTs the default document, so report it without another GET
+                        result["bgp_routing"] = _default_bgp_routing()
                     except (APIError, InvalidObjectError) as e:
-                        module.fail_json(
-                            msg=f"API Error resetting BGP routing configuration: {str(e)}",
-                            error_code=getattr(e, "error_code", None),
-                            details=getattr(e, "details", None),
-                        )
+                        handle_scm_error(module, e, f"API Error resetting BGP routing configuration: {str(e)}")
                 else:
                     # In check mode, show what defaults would be
-                    result["bgp_routing"] = {
-                        "routing_preference": {"default": {}},
-                        "backbone_routing": "no-asymmetric-routing",
-                        "accept_route_over_SC": False,
-                        "outbound_routes_for_services": [],
-                        "add_host_route_to_ike_peer": False,
-                        "withdraw_static_route": False,
-                    }
+                    result["bgp_routing"] = _default_bgp_routing()
 
                 result["changed"] = True
                 module.exit_json(**result)
             else:
                 # Already at defaults
-                result["bgp_routing"] = json.loads(current_config.model_dump_json(exclude_unset=True))
+                result["bgp_routing"] = current_config.model_dump(mode="json", exclude_unset=True)
                 result["changed"] = False
                 module.exit_json(**result)
 
         # Handle present state - configure BGP routing
         elif params.get("state") == "present":
+            routing_preference = params["routing_preference"]
+            backbone_routing = params["backbone_routing"]
+
             # Build update payload
             update_fields = {}
 
             # Handle routing_preference
-            if params.get("routing_preference") is not None:
-                if params.get("routing_preference") == "default":
-                    update_fields["routing_preference"] = {"default": {}}
-                elif params.get("routing_preference") == "hot_potato_routing":
-                    update_fields["routing_preference"] = {"hot_potato_routing": {}}
+            if routing_preference is not None:
+                update_fields["routing_preference"] = dict(_ROUTING_PREF_PAYLOAD[routing_preference])
 
             # Add backbone_routing
-            if params.get("backbone_routing") is not None:
-                update_fields["backbone_routing"] = params.get("backbone_routing")
-
-            # Add other fields
-            for field in [
-                "accept_route_over_sc",
-                "outbound_routes_for_services",
-                "add_host_route_to_ike_peer",
-                "withdraw_static_route",
-            ]:
-                if params.get(field) is not None:
-                    # Map accept_route_over_sc to API field name
-                    api_field = "accept_route_over_SC" if field == "accept_route_over_sc" else field
-                    update_fields[api_field] = params.get(field)
+            if backbone_routing is not None:
+                update_fields["backbone_routing"] = backbone_routing
+
+            # Add other fields under their API names
+            for api_field, param_field in _FIELD_MAP:
+                value = params[param_field]
+                if value is not None:
+                    update_fields[api_field] = value
 
             # Check if update is needed by comparing with current config
-            needs_update = False
-
-            # Compare routing_preference
-            if "routing_preference" in update_fields:
-                current_pref = current_config.routing_preference
-                if hasattr(current_pref, "default"):
-                    current_pref_type = "default"
-                elif hasattr(current_pref, "hot_potato_routing"):
-                    current_pref_type = "hot_potato_routing"
-                else:
-                    current_pref_type = None
-
-                if params.get("routing_preference") and params.get("routing_preference") != current_pref_type:
-                    needs_update = True
-
-            # Compare backbone_routing
-            if "backbone_routing" in update_fields:
-                if str(current_config.backbone_routing) != update_fields["backbone_routing"]:
-                    needs_update = True
-
-            # Compare boolean and list fields
-            for api_field, param_field in [
-                ("accept_route_over_SC", "accept_route_over_sc"),
-                ("outbound_routes_for_services", "outbound_routes_for_services"),
-                ("add_host_route_to_ike_peer", "add_host_route_to_ike_peer"),
-                ("withdraw_static_route", "withdraw_static_route"),
-            ]:
-                if api_field in update_fields:
-                    current_value = getattr(current_config, api_field, None)
-                    if isinstance(update_fields[api_field], list):
-                        # Sort lists for comparison
-                        current_sorted = sorted(current_value) if current_value else []
-                        new_sorted = sorted(update_fields[api_field]) if update_fields[api_field] else []
-                        if current_sorted != new_sorted:
-                            needs_update = True
-                    elif current_value != update_fields[api_field]:
-                        needs_update = True
+            needs_update = _needs_update(current_config, update_fields)
 
             # Update if needed
             if needs_update:
                 if not module.check_mode:
                     try:
                         updated = client.bgp_routing.update(update_fields)
-                        result["bgp_routing"] = json.loads(updated.model_dump_json(exclude_unset=True))
+                        invalidate_read(cache_key)
+                        result["bgp_routing"] = updated.model_dump(mode="json", exclude_unset=True)
                     except InvalidObjectError as e:
-                        module.fail_json(
-                            msg=f"Invalid BGP routing configuration: {str(e)}",
-                            error_code=getattr(e, "error_code", None),
-                            details=getattr(e, "details", None),
-                            payload=update_fields,
-                        )
+                        handle_scm_error(module, e, f"Invalid BGP routing configuration: {str(e)}", payload=update_fields)
                     except APIError as e:
-                        module.fail_json(
-                            msg=f"API Error updating BGP routing configuration: {str(e)}",
-                            error_code=getattr(e, "error_code", None),
-                            details=getattr(e, "details", None),
-                            payload=update_fields,
+                        handle_scm_error(
+                            module, e, f"API Error updating BGP routing configuration: {str(e)}", payload=update_fields
                         )
                 else:
                     # In check mode, return current config
-                    result["bgp_routing"] = json.loads(current_config.model_dump_json(exclude_unset=True))
+                    result["bgp_routing"] = current_config.model_dump(mode="json", exclude_unset=True)
 
                 result["changed"] = True
                 module.exit_json(**result)
             else:
                 # No update needed
-                result["bgp_routing"] = json.loads(current_config.model_dump_json(exclude_unset=True))
+                result["bgp_routing"] = current_config.model_dump(mode="json", exclude_unset=True)
                 result["changed"] = False
                 module.exit_json(**result)
 
     # Handle errors
     except (InvalidObjectError, APIError) as e:
-        module.fail_json(msg=str(e), error_code=getattr(e, "error_code", None), details=getattr(e, "details", None))
+        handle_scm_error(module, e)
     except Exception as e:
         module.fail_json(msg="Unexpected error: " + str(e))
 
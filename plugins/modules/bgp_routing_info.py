@@ -3,11 +3,15 @@
 # Copyright: (c) 2025, Calvin Remsburg (@cdot65) <dev@cdot.io>
 # GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
-import json
-
 from ansible.module_utils.basic import AnsibleModule
-from scm.client import ScmClient
-from scm.exceptions import APIError, InvalidObjectError
+from ansible_collections.cdot65.scm.plugins.module_utils.client import handle_scm_error
+from ansible_collections.cdot65.scm.plugins.module_utils.connection import (
+    DEFAULT_API_URL,
+    cached_read,
+    get_cached_client,
+    token_fingerprint,
+    validate_api_url,
+)
 
 DOCUMENTATION = r"""
 ---
@@ -37,6 +41,10 @@ notes:
     - Check mode is supported but makes no changes.
     - BGP routing is a singleton object - there is only one configuration per SCM instance.
     - This configuration does not belong to a folder, snippet, or device container.
+    - "The result is the same for every inventory host, so read it once per play with C(run_once: true) and
+      reference the registered result from other hosts through C(hostvars)."
+    - Reads are cached for 30 seconds per API URL and access token within a worker process, and the cache is
+      cleared when M(cdot65.scm.bgp_routing) changes the configuration.
 """
 
 EXAMPLES = r"""
@@ -46,6 +54,12 @@ EXAMPLES = r"""
     scm_access_token: "{{ scm_access_token }}"
   register: bgp_config
 
+- name: Read BGP routing once for all hosts in the play
+  cdot65.scm.bgp_routing_info:
+    scm_access_token: "{{ scm_access_token }}"
+  run_once: true
+  register: tenant_bgp_config
+
 - name: Display BGP routing configuration
   debug:
     msg: "Backbone routing: {{ bgp_config.bgp_routing.backbone_routing }}"
@@ -98,39 +112,47 @@ bgp_routing:
 """
 
 
-def main():
-    module_args = dict(
-        scm_access_token=dict(type="str", required=True, no_log=True),
-        api_url=dict(type="str", required=False),
-    )
+_MODULE_ARGS = dict(
+    scm_access_token=dict(type="str", required=True, no_log=True),
+    api_url=dict(type="str", required=False),
+)
 
+
+def main():
     # Initialize module
     module = AnsibleModule(
-        argument_spec=module_args,
+        argument_spec=_MODULE_ARGS,
         supports_check_mode=True,
     )
 
+    try:
+        from scm.exceptions import APIError, InvalidObjectError
+    except ImportError:
+        module.fail_json(msg="pan-scm-sdk required")
+
     # Get parameters
     params = module.params
 
+    try:
+        api_url = validate_api_url(params.get("api_url") or DEFAULT_API_URL)
+    except ValueError as e:
+        module.fail_json(msg=str(e))
+
     # Initialize results
     result = {"changed": False, "bgp_routing": None}
 
     # Perform operations
     try:
-        # Initialize SCM client
-        client = ScmClient(access_token=params.get("scm_access_token"))
+        # Initialize SCM client, reusing one already built for this token in this process
+        client = get_cached_client(api_url, params.get("scm_access_token"))
+        cache_key = ("bgp_routing", api_url, token_fingerprint(params.get("scm_access_token")))
 
         # Get BGP routing configuration
         try:
-            bgp_config = client.bgp_routing.get()
-            result["bgp_routing"] = json.loads(bgp_config.model_dump_json(exclude_unset=True))
+            bgp_config = cached_read(cache_key, client.bgp_routing.get)
+            result["bgp_routing"] = bgp_config.model_dump(mode="json", exclude_unset=True)
         except (APIError, InvalidObjectError) as e:
-            module.fail_json(
-                msg=f"API error retrieving BGP routing configuration: {str(e)}",
-                error_code=getattr(e, "error_code", None),
-                details=getattr(e, "details", None),
-            )
+            handle_scm_error(module, e, f"API error retrieving BGP routing configuration: {str(e)}")
 
         # Return results
         module.exit_json(**result)
@@ -3,12 +3,15 @@
 # Copyright: (c) 2025, Calvin Remsburg (@cdot65) <dev@cdot.io>
 # GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
-import json
-
 from ansible.module_utils.basic import AnsibleModule
-from scm.client import Scm as ScmClient
-from scm.exceptions import APIError, ObjectNotPresentError
-from scm.models.security import DecryptionProfileCreateModel
+from ansible_collections.cdot65.scm.plugins.module_utils.connection import (
+    DEFAULT_API_URL,
+    cached_read,
+    get_cached_client,
+    invalidate_read,
+    token_fingerprint,
+    validate_api_url,
+)
 
 DOCUMENTATION = r"""
 ---
@@ -192,31 +195,97 @@ decryption_profile:
 """
 
 
-def main():
-    """Main module execution."""
-    module_args = dict(
-        name=dict(type="str", required=False),
-        ssl_forward_proxy=dict(type="dict", required=False),
-        ssl_inbound_proxy=dict(type="dict", required=False),
-        ssl_no_proxy=dict(type="dict", required=False),
-        ssl_protocol_settings=dict(type="dict", required=False),
-        folder=dict(type="str", required=False),
-        snippet=dict(type="str", required=False),
-        device=dict(type="str", required=False),
-        id=dict(type="str", required=False),
-        scm_access_token=dict(type="str", required=True, no_log=True),
-        api_url=dict(type="str", required=False),
-        state=dict(type="str", choices=["present", "absent"], default="present"),
+_CONTAINER_TYPES = ("folder", "snippet", "device")
+
+_MODULE_ARGS = dict(
+    name=dict(type="str", required=False),
+    ssl_forward_proxy=dict(type="dict", required=False),
+    ssl_inbound_proxy=dict(type="dict", required=False),
+    ssl_no_proxy=dict(type="dict", required=False),
+    ssl_protocol_settings=dict(type="dict", required=False),
+    folder=dict(type="str", required=False),
+    snippet=dict(type="str", required=False),
+    device=dict(type="str", required=False),
+    id=dict(type="str", required=False),
+    scm_access_token=dict(type="str", required=True, no_log=True),
+    api_url=dict(type="str", required=False),
+    state=dict(type="str", choices=["present", "absent"], default="present"),
+)
+
+# Scalar parameters unpacked into locals at the top of main()
+_PARAM_KEYS = ("name", "id", "scm_access_token", "api_url", "state")
+
+_MUTUALLY_EXCLUSIVE = [
+    list(_CONTAINER_TYPES),
+]
+
+
+# Fields compared against the existing profile to decide whether an update is needed
+_FIELDS = ("name", "ssl_forward_proxy", "ssl_inbound_proxy", "ssl_no_proxy", "ssl_protocol_settings")
+_COMPARE_FIELDS = frozenset(_FIELDS)
+_SSL_FIELDS = _FIELDS[1:]
+
+
+def _profiles_by_name(client, cache_key, lookup_params):
+    """Return the profiles of one container keyed by name.
+
+    One list call per container replaces a fetch per profile, and the result is
+    shared by tasks running in the same process for the same container.
+
+    Args:
+        client: SCM client
+        cache_key: Key for the shared read cache
+        lookup_params: Container keyword, e.g. {"folder": "Texas"}
+
+    Returns:
+        dict: Profile models keyed by name
+    """
+    return cached_read(
+        cache_key,
+        lambda: {p.name: p for p in client.decryption_profile.list(exact_match=True, **lookup_params)},
     )
 
+
+def _find_profile(client, cache_key, lookup_params, name):
+    """Return the named profile visible from a container, or None.
+
+    The container's own profiles come from the cached listing. A name missing
+    there is resolved with fetch(), which also finds profiles the container
+    inherits from a parent folder.
+
+    Args:
+        client: SCM client
+        cache_key: Key for the shared read cache
+        lookup_params: Container keyword, e.g. {"folder": "Texas"}
+        name: Profile name
+
+    Returns:
+        DecryptionProfileResponseModel: The profile, or None when it does not exist
+    """
+    from scm.exceptions import NotFoundError
+
+    profile = _profiles_by_name(client, cache_key, lookup_params).get(name)
+    if profile is None:
+        try:
+            profile = client.decryption_profile.fetch(name=name, **lookup_params)
+        except NotFoundError:
+            return None
+    return profile
+
+
+def main():
+    """Main module execution."""
     module = AnsibleModule(
-        argument_spec=module_args,
+        argument_spec=_MODULE_ARGS,
         supports_check_mode=True,
-        mutually_exclusive=[
-            ["folder", "snippet", "device"],
-        ],
+        mutually_exclusive=_MUTUALLY_EXCLUSIVE,
     )
 
+    try:
+        from scm.exceptions import APIError, ObjectNotPresentError
+    except ImportError:
+        module.fail_json(msg="pan-scm-sdk required")
+
     result = {
         "changed": False,
         "msg": "",
@@ -225,34 +294,41 @@ def main():
 
     # Get module parameters
     params = module.params
-    state = params["state"]
-    scm_access_token = params["scm_access_token"]
-    api_url = params.get("api_url") or "https://api.strata.paloaltonetworks.com"
+    profile_name, profile_id, scm_access_token, api_url, state = map(params.get, _PARAM_KEYS)
+    try:
+        api_url = validate_api_url(api_url or DEFAULT_API_URL)
+    except ValueError as e:
+        module.fail_json(msg=str(e))
 
-    # Initialize the SCM client with bearer token
+    # Determine container type and name
+    container_type, container_name = next(((c, params[c]) for c in _CONTAINER_TYPES if params.get(c)), (None, None))
+
+    # Settle everything that needs no network before building the client
+    if state == "present":
+        if not container_type:
+            module.fail_json(msg="One of 'folder', 'snippet', or 'device' is required when state=present")
+
+        if not profile_name:
+            module.fail_json(msg="'name' is required when state=present")
+    elif not profile_id and not (profile_name and container_type):
+        # Nothing identifies a profile, so there is nothing to look up or delete
+        result["msg"] = f"Decryption profile '{profile_name}' not found, nothing to delete"
+        module.exit_json(**result)
+
+    # Initialize the SCM client, reusing one already built for this token in this process
     try:
-        client = ScmClient(access_token=scm_access_token, api_base_url=api_url)
+        client = get_cached_client(api_url, scm_access_token)
     except Exception as e:
         module.fail_json(msg=f"Failed to initialize SCM client: {e!s}")
 
-    # Determine container type and name
-    container_type = None
-    container_name = None
-    for ctype in ["folder", "snippet", "device"]:
-        if params.get(ctype):
-            container_type = ctype
-            container_name = params[ctype]
-            break
-
     # Build the lookup parameters
-    lookup_params = {}
-    if container_type and container_name:
-        lookup_params[container_type] = container_name
+    lookup_params = {container_type: container_name} if container_type else {}
+
+    # Profiles of this container are listed once and shared via the read cache
+    list_key = ("decryption_profile", api_url, token_fingerprint(scm_access_token), container_type, container_name)
 
     # Check if profile exists
     existing_profile = None
-    profile_id = params.get("id")
-    profile_name = params.get("name")
 
     if profile_id:
         # Lookup by ID
@@ -265,9 +341,7 @@ def main():
     elif profile_name and container_type:
         # Lookup by name and container
         try:
-            existing_profile = client.decryption_profile.fetch(name=profile_name, **lookup_params)
-        except ObjectNotPresentError:
-            existing_profile = None
+            existing_profile = _find_profile(client, list_key, lookup_params, profile_name)
         except APIError as e:
             module.fail_json(msg=f"Failed to fetch profile by name: {e!s}")
 
@@ -276,6 +350,7 @@ def main():
             if not module.check_mode:
                 try:
                     client.decryption_profile.delete(str(existing_profile.id))
+                    invalidate_read(list_key)
                     result["msg"] = f"Decryption profile '{profile_name or profile_id}' deleted successfully"
                 except APIError as e:
                     module.fail_json(msg=f"Failed to delete profile: {e!s}")
@@ -286,92 +361,52 @@ def main():
             result["msg"] = f"Decryption profile '{profile_name or profile_id}' not found, nothing to delete"
         module.exit_json(**result)
 
-    if not container_type:
-        module.fail_json(msg="One of 'folder', 'snippet', or 'device' is required when state=present")
-
-    if not profile_name:
-        module.fail_json(msg="'name' is required when state=present")
-
     # Build the profile data
     profile_data = {
         "name": profile_name,
         container_type: container_name,
+        **{field: params[field] for field in _SSL_FIELDS if params.get(field)},
     }
 
-    if params.get("ssl_forward_proxy"):
-        profile_data["ssl_forward_proxy"] = params["ssl_forward_proxy"]
-
-    if params.get("ssl_inbound_proxy"):
-        profile_data["ssl_inbound_proxy"] = params["ssl_inbound_proxy"]
-
-    if params.get("ssl_no_proxy"):
-        profile_data["ssl_no_proxy"] = params["ssl_no_proxy"]
-
-    if params.get("ssl_protocol_settings"):
-        profile_data["ssl_protocol_settings"] = params["ssl_protocol_settings"]
-
     # Validate and prepare the profile data using SDK models
+    from scm.models.security import DecryptionProfileCreateModel, DecryptionProfileUpdateModel
+
     try:
         profile_model = DecryptionProfileCreateModel(**profile_data)
     except Exception as e:
         module.fail_json(msg=f"Failed to validate profile data: {e!s}")
 
     if existing_profile:
-        # Check if update is needed
-        needs_update = False
-        update_fields = []
-
-        # Compare name
-        if existing_profile.name != profile_model.name:
-            needs_update = True
-            update_fields.append("name")
-
-        # Compare ssl_forward_proxy
-        existing_forward = getattr(existing_profile, "ssl_forward_proxy", None)
-        if existing_forward != profile_data.get("ssl_forward_proxy"):
-            needs_update = True
-            update_fields.append("ssl_forward_proxy")
-
-        # Compare ssl_inbound_proxy
-        existing_inbound = getattr(existing_profile, "ssl_inbound_proxy", None)
-        if existing_inbound != profile_data.get("ssl_inbound_proxy"):
-            needs_update = True
-            update_fields.append("ssl_inbound_proxy")
-
-        # Compare ssl_no_proxy
-        existing_no_proxy = getattr(existing_profile, "ssl_no_proxy", None)
-        if existing_no_proxy != profile_data.get("ssl_no_proxy"):
-            needs_update = True
-            update_fields.append("ssl_no_proxy")
-
-        # Compare ssl_protocol_settings
-        existing_protocol = getattr(existing_profile, "ssl_protocol_settings", None)
-        if existing_protocol != profile_data.get("ssl_protocol_settings"):
-            needs_update = True
-            update_fields.append("ssl_protocol_settings")
-
-        if needs_update:
+        # Check if update is needed, comparing the JSON form of both models in one pass each
+        new = profile_model.model_dump(mode="json", include=_COMPARE_FIELDS)
+        old = existing_profile.model_dump(mode="json", include=_COMPARE_FIELDS)
+        update_fields = tuple(field for field in _FIELDS if new.get(field) != old.get(field))
+
+        if update_fields:
+            changed_fields = ", ".join(update_fields)
             if not module.check_mode:
                 try:
-                    profile_data["id"] = str(existing_profile.id)
-                    updated_profile = client.decryption_profile.update(existing_profile)
-                    result["decryption_profile"] = json.loads(updated_profile.model_dump_json())
-                    result["msg"] = f"Decryption profile '{profile_name}' updated: {', '.join(update_fields)}"
+                    update_model = DecryptionProfileUpdateModel(id=existing_profile.id, **profile_data)
+                    updated_profile = client.decryption_profile.update(update_model)
+                    invalidate_read(list_key)
+                    result["decryption_profile"] = updated_profile.model_dump(mode="json")
+                    result["msg"] = f"Decryption profile '{profile_name}' updated: {changed_fields}"
                 except APIError as e:
                     module.fail_json(msg=f"Failed to update profile: {e!s}")
             else:
                 result["decryption_profile"] = profile_data
-                result["msg"] = f"Would update Decryption profile '{profile_name}': {', '.join(update_fields)}"
+                result["msg"] = f"Would update Decryption profile '{profile_name}': {changed_fields}"
             result["changed"] = True
         else:
-            result["decryption_profile"] = json.loads(existing_profile.model_dump_json())
+            result["decryption_profile"] = existing_profile.model_dump(mode="json")
             result["msg"] = f"Decryption profile '{profile_name}' already exists with correct configuration"
     else:
         # Create new profile
         if not module.check_mode:
             try:
                 created_profile = client.decryption_profile.create(profile_data)
-                result["decryption_profile"] = json.loads(created_profile.model_dump_json())
+                invalidate_read(list_key)
+                result["decryption_profile"] = created_profile.model_dump(mode="json")
                 result["msg"] = f"Decryption profile '{profile_name}' created successfully"
             except APIError as e:
                 module.fail_json(msg=f"Failed to create profile: {e!s}")
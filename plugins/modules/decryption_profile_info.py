@@ -3,11 +3,12 @@
 # Copyright: (c) 2025, Calvin Remsburg (@cdot65) <dev@cdot.io>
 # GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
-import json
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
 from ansible.module_utils.basic import AnsibleModule
-from scm.client import Scm as ScmClient
-from scm.exceptions import APIError, ObjectNotPresentError
+from ansible_collections.cdot65.scm.plugins.module_utils.connection import DEFAULT_API_URL, get_cached_client, validate_api_url
+from ansible_collections.cdot65.scm.plugins.module_utils.paging import iter_pages
 
 DOCUMENTATION = r"""
 ---
@@ -26,6 +27,15 @@ options:
             - If not provided, all profiles in the specified container will be returned.
         type: str
         required: false
+    names:
+        description:
+            - Names of Decryption profiles to retrieve from the specified container.
+            - Lookups are issued concurrently, up to 8 at a time.
+            - Names that do not exist are skipped.
+            - Mutually exclusive with I(name) and I(id).
+        type: list
+        elements: str
+        required: false
     folder:
         description:
             - The folder in which to search for the resource.
@@ -81,6 +91,15 @@ EXAMPLES = r"""
     scm_access_token: "{{ scm_access_token }}"
   register: profile_info
 
+- name: Get several Decryption profiles by name
+  cdot65.scm.decryption_profile_info:
+    names:
+      - "Example-Basic-Decryption"
+      - "Example-Inbound-Decryption"
+    folder: "Texas"
+    scm_access_token: "{{ scm_access_token }}"
+  register: selected_profiles
+
 - name: Get a specific Decryption profile by ID
   cdot65.scm.decryption_profile_info:
     id: "123e4567-e89b-12d3-a456-426655440000"
@@ -97,26 +116,61 @@ decryption_profiles:
 """
 
 
+_CONTAINER_TYPES = ("folder", "snippet", "device")
+
+_MODULE_ARGS = dict(
+    name=dict(type="str", required=False),
+    names=dict(type="list", elements="str", required=False),
+    folder=dict(type="str", required=False),
+    snippet=dict(type="str", required=False),
+    device=dict(type="str", required=False),
+    id=dict(type="str", required=False),
+    scm_access_token=dict(type="str", required=True, no_log=True),
+    api_url=dict(type="str", required=False),
+)
+
+# Scalar parameters unpacked into locals at the top of main()
+_PARAM_KEYS = ("name", "names", "id", "scm_access_token", "api_url")
+
+_MUTUALLY_EXCLUSIVE = [
+    list(_CONTAINER_TYPES),
+    ["name", "names", "id"],
+]
+
+
+@functools.lru_cache(maxsize=1)
+def _profile_list_adapter():
+    """Build the pydantic adapter that dumps a whole list of profiles in one call."""
+    from pydantic import TypeAdapter
+    from scm.models.security import DecryptionProfileResponseModel
+
+    return TypeAdapter(list[DecryptionProfileResponseModel])
+
+
+def _fetch_or_none(service, name, container):
+    """Fetch one profile by name, returning None when it does not exist."""
+    from scm.exceptions import ObjectNotPresentError
+
+    try:
+        return service.fetch(name=name, **container)
+    except ObjectNotPresentError:
+        return None
+
+
 def main():
     """Main module execution."""
-    module_args = dict(
-        name=dict(type="str", required=False),
-        folder=dict(type="str", required=False),
-        snippet=dict(type="str", required=False),
-        device=dict(type="str", required=False),
-        id=dict(type="str", required=False),
-        scm_access_token=dict(type="str", required=True, no_log=True),
-        api_url=dict(type="str", required=False),
-    )
-
     module = AnsibleModule(
-        argument_spec=module_args,
+        argument_spec=_MODULE_ARGS,
         supports_check_mode=True,
-        mutually_exclusive=[
-            ["folder", "snippet", "device"],
-        ],
+        mutually_exclusive=_MUTUALLY_EXCLUSIVE,
     )
 
+    try:
+        from pydantic import ValidationError
+        from scm.exceptions import APIError, ObjectNotPresentError
+    except ImportError:
+        module.fail_json(msg="pan-scm-sdk required")
+
     result = {
         "changed": False,
         "decryption_profiles": [],
@@ -124,52 +178,62 @@ def main():
 
     # Get module parameters
     params = module.params
-    scm_access_token = params["scm_access_token"]
-    api_url = params.get("api_url") or "https://api.strata.paloaltonetworks.com"
+    profile_name, profile_names, profile_id, scm_access_token, api_url = map(params.get, _PARAM_KEYS)
+    try:
+        api_url = validate_api_url(api_url or DEFAULT_API_URL)
+    except ValueError as e:
+        module.fail_json(msg=str(e))
+
+    # Determine container type and name
+    container_type, container_name = next(((c, params[c]) for c in _CONTAINER_TYPES if params.get(c)), (None, None))
 
-    # Initialize the SCM client with bearer token
+    # Reject unusable input before building the client
+    if not profile_id and not container_type:
+        module.fail_json(msg="One of 'id', 'name' (with container), or a container type must be provided")
+
+    # Initialize the SCM client, reusing one already built for this token in this process
     try:
-        client = ScmClient(access_token=scm_access_token, api_base_url=api_url)
+        client = get_cached_client(api_url, scm_access_token)
     except Exception as e:
         module.fail_json(msg=f"Failed to initialize SCM client: {e!s}")
 
-    # Determine container type and name
-    container_type = None
-    container_name = None
-    for ctype in ["folder", "snippet", "device"]:
-        if params.get(ctype):
-            container_type = ctype
-            container_name = params[ctype]
-            break
-
-    # Get profile ID and name if provided
-    profile_id = params.get("id")
-    profile_name = params.get("name")
-
     try:
         if profile_id:
             # Lookup by ID
             try:
                 profile = client.decryption_profile.fetch(profile_id)
-                result["decryption_profiles"] = [json.loads(profile.model_dump_json())]
+                result["decryption_profiles"] = [profile.model_dump(mode="json")]
             except ObjectNotPresentError:
                 result["decryption_profiles"] = []
         elif profile_name and container_type:
             # Lookup by name and container
             try:
                 profile = client.decryption_profile.fetch(name=profile_name, **{container_type: container_name})
-                result["decryption_profiles"] = [json.loads(profile.model_dump_json())]
+                result["decryption_profiles"] = [profile.model_dump(mode="json")]
             except ObjectNotPresentError:
                 result["decryption_profiles"] = []
+        elif profile_names and container_type:
+            # Fetch each requested profile concurrently, preserving the requested order
+            service = client.decryption_profile
+            container = {container_type: container_name}
+            with ThreadPoolExecutor(max_workers=min(8, len(profile_names))) as executor:
+                profiles = executor.map(lambda n: _fetch_or_none(service, n, container), profile_names)
+                result["decryption_profiles"] = [
+                    profile.model_dump(mode="json")
+                    for requested, profile in zip(profile_names, profiles)
+                    if profile is not None and profile.name == requested
+                ]
         elif container_type:
-            # List all profiles in the container
-            profiles = client.decryption_profile.list(**{container_type: container_name})
-            result["decryption_profiles"] = [json.loads(p.model_dump_json()) for p in profiles]
-        else:
-            module.fail_json(msg="One of 'id', 'name' (with container), or a container type must be provided")
+            # List all profiles in the container, validating and dumping one page at a time
+            adapter = _profile_list_adapter()
+            profiles = result["decryption_profiles"]
+            for page in iter_pages(client, client.decryption_profile, {container_type: container_name}):
+                profiles.extend(adapter.dump_python(adapter.validate_python(page), mode="json"))
 
     except APIError as e:
         module.fail_json(msg=f"Failed to retrieve Decryption profiles: {e!s}")
+    except ValidationError as e:
+        module.fail_json(msg=f"Invalid Decryption profile data in API response: {e!s}")
 
     module.exit_json(**result)
 
@@ -3,11 +3,19 @@
 # Copyright: (c) 2025, Calvin Remsburg (@cdot65) <dev@cdot.io>
 # GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
-import json
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
 from ansible.module_utils.basic import AnsibleModule
-from scm.client import ScmClient
-from scm.exceptions import APIError, InvalidObjectError, ObjectNotPresentError
+from ansible_collections.cdot65.scm.plugins.module_utils.connection import (
+    DEFAULT_API_URL,
+    cached_read,
+    get_cached_client,
+    token_fingerprint,
+    validate_api_url,
+)
+from ansible_collections.cdot65.scm.plugins.module_utils.paging import page_records
+from ansible_collections.cdot65.scm.plugins.module_utils.serialization import use_fast_json
 
 DOCUMENTATION = r"""
 ---
@@ -25,15 +33,24 @@ options:
         description:
             - The ID of the device to retrieve (typically the serial number).
             - If specified, the module will return information about this specific device.
-            - Mutually exclusive with I(name).
+            - Mutually exclusive with I(ids) and I(name).
         type: str
         required: false
+    ids:
+        description:
+            - IDs of several devices to retrieve.
+            - Lookups are issued concurrently, up to 8 at a time.
+            - IDs that do not exist are skipped.
+            - Mutually exclusive with I(id) and I(name).
+        type: list
+        elements: str
+        required: false
     name:
         description:
             - The display name of the device to retrieve.
             - If specified, the module will search for devices with this display_name.
             - This matches the name shown in the SCM UI, not the device's internal name/ID.
-            - Mutually exclusive with I(id).
+            - Mutually exclusive with I(id) and I(ids).
         type: str
         required: false
     serial_number:
@@ -62,6 +79,22 @@ options:
             - If true, only show device-only entries.
         type: bool
         required: false
+    fields:
+        description:
+            - Device attributes to return, for example C(id) and C(hostname).
+            - When set, each returned device only contains these keys, which keeps large results small.
+            - The full device is still read from the API, which has no field selector.
+        type: list
+        elements: str
+        required: false
+    page_size:
+        description:
+            - Number of devices requested per API call when listing devices.
+            - Defaults to the API maximum so large inventories need as few round trips as possible.
+            - Values above the API maximum are capped to it.
+        type: int
+        required: false
+        default: 1000
     scm_access_token:
         description:
             - The access token for SCM authentication.
@@ -76,6 +109,8 @@ notes:
     - Check mode is supported but does not change behavior since this is a read-only module.
     - This module uses the pan-scm-sdk for interacting with the SCM API.
     - Pagination is handled internally when retrieving large device lists.
+    - Tasks running in the same process reuse one SCM client and its HTTP connections.
+    - To reuse device lists across plays, register the result and enable Ansible fact caching (for example C(jsonfile)).
 """
 
 EXAMPLES = r"""
@@ -90,12 +125,28 @@ EXAMPLES = r"""
     scm_access_token: "{{ scm_access_token }}"
   register: device_details
 
+- name: Get several devices by ID
+  cdot65.scm.device_info:
+    ids:
+      - "0123456789"
+      - "9876543210"
+    scm_access_token: "{{ scm_access_token }}"
+  register: selected_devices
+
 - name: Get a specific device by display name
   cdot65.scm.device_info:
     name: "Datacenter-Firewall-01"  # This should match the display_name in SCM UI
     scm_access_token: "{{ scm_access_token }}"
   register: named_device
 
+- name: Get only the ID and hostname of every device
+  cdot65.scm.device_info:
+    fields:
+      - id
+      - hostname
+    scm_access_token: "{{ scm_access_token }}"
+  register: device_hostnames
+
 - name: Get all VM-series firewalls
   cdot65.scm.device_info:
     model: "PA-VM"
@@ -194,15 +245,153 @@ total:
 """
 
 
+# Filters the devices endpoint applies itself; all but type are also matched exactly client-side, as the SDK does
+_SERVER_FILTERS = ("type", "serial_number", "model")
+
+
+@functools.lru_cache(maxsize=1)
+def _device_list_adapter():
+    """Build the pydantic adapter that validates and dumps a page of devices in one call."""
+    from pydantic import TypeAdapter
+    from scm.models.setup.device import DeviceResponseModel
+
+    return TypeAdapter(list[DeviceResponseModel])
+
+
+def _iter_device_pages(client, **filters):
+    """Yield the matching devices of each API page.
+
+    Mirrors ``client.device.list()`` but validates each page as it arrives, so
+    callers can convert and discard devices without holding every page at once.
+
+    Args:
+        client: SCM client
+        **filters: Device filters such as model, type, serial_number or device_only
+
+    Yields:
+        list: DeviceResponseModel objects of one page matching the filters
+    """
+    adapter = _device_list_adapter()
+    service = client.device
+    page_size = service.max_limit
+    params = {key: filters[key] for key in _SERVER_FILTERS if key in filters}
+    checks = [(key, value) for key, value in filters.items() if key != "type"]
+
+    def fetch(offset):
+        response = client.get(service.ENDPOINT, params={**params, "limit": page_size, "offset": offset})
+        # A filter that matches a single device may return it unwrapped
+        return response, page_records(response, single_object=True)
+
+    def matching(items):
+        return [
+            device
+            for device in adapter.validate_python(items)
+            if all(getattr(device, key, None) == value for key, value in checks)
+        ]
+
+    response, items = fetch(0)
+    yield matching(items)
+    if len(items) < page_size:
+        return
+
+    total = response.get("total")
+    if isinstance(total, int):
+        # The first page reports the total, so request the remaining pages concurrently, in order
+        offsets = range(page_size, total, page_size)
+        if offsets:
+            with ThreadPoolExecutor(max_workers=min(8, len(offsets))) as executor:
+                for _, items in executor.map(fetch, offsets):
+                    yield matching(items)
+        return
+
+    offset = page_size
+    while True:
+        _, items = fetch(offset)
+        yield matching(items)
+        if len(items) < page_size:
+            break
+        offset += page_size
+
+
+def _list_devices(client, cache_key, **filters):
+    """Return the converted devices matching ``filters``.
+
+    The converted listing is kept in the shared read cache, so device_info
+    tasks in the same process with the same filters, including display name
+    lookups, are served by a single listing.
+
+    Args:
+        client: SCM client
+        cache_key: Key for the shared read cache, excluding the filters
+        **filters: Device filters passed to ``_iter_device_pages``
+
+    Returns:
+        list: Devices as JSON-safe dicts
+    """
+
+    def build():
+        # Each page is dumped by pydantic-core in one call rather than model by model
+        adapter = _device_list_adapter()
+        devices = []
+        for page in _iter_device_pages(client, **filters):
+            devices.extend(adapter.dump_python(page, mode="json", exclude_unset=True))
+        return devices
+
+    return cached_read((*cache_key, tuple(sorted(filters.items()))), build)
+
+
+def _devices_by_display_name(client, cache_key, **filters):
+    """Return the devices matching ``filters`` indexed by display name.
+
+    The devices API has no display name lookup, so the index is built once
+    from the shared listing and cached next to it, turning repeated name
+    lookups in one process into dictionary hits.
+
+    Args:
+        client: SCM client
+        cache_key: Key for the shared read cache, excluding the filters
+        **filters: Device filters passed to ``_list_devices``
+
+    Returns:
+        dict: Lists of device dicts keyed by display name
+    """
+
+    def build():
+        index = {}
+        for device in _list_devices(client, cache_key, **filters):
+            index.setdefault(device.get("display_name", ""), []).append(device)
+        return index
+
+    return cached_read((*cache_key, "display_name", tuple(sorted(filters.items()))), build)
+
+
+# Parameters unpacked into locals at the top of main(), and the optional listing filters
+_PARAM_KEYS = ("id", "ids", "name", "serial_number", "scm_access_token", "page_size")
+_FILTER_KEYS = ("model", "type", "device_only")
+
+
+def _get_or_none(client, device_id):
+    """Get one device by id, returning None when it does not exist."""
+    from scm.exceptions import ObjectNotPresentError
+
+    try:
+        return client.device.get(device_id)
+    except ObjectNotPresentError:
+        return None
+
+
 def main():
     # Define the module argument specification
     module_args = dict(
         id=dict(type="str", required=False),
+        ids=dict(type="list", elements="str", required=False),
         name=dict(type="str", required=False),
         serial_number=dict(type="str", required=False),
         model=dict(type="str", required=False),
         type=dict(type="str", required=False),
         device_only=dict(type="bool", required=False),
+        fields=dict(type="list", elements="str", required=False),
+        page_size=dict(type="int", required=False, default=1000),
         scm_access_token=dict(type="str", required=True, no_log=True),
         api_url=dict(type="str", required=False),
     )
@@ -210,89 +399,85 @@ def main():
     # Create the module
     module = AnsibleModule(
         argument_spec=module_args,
-        mutually_exclusive=[["id", "name"]],
+        mutually_exclusive=[["id", "ids", "name"]],
         supports_check_mode=True,
     )
+    use_fast_json(module)
+
+    try:
+        from scm.exceptions import APIError, InvalidObjectError, ObjectNotPresentError
+    except ImportError:
+        module.fail_json(msg="pan-scm-sdk required")
 
     # Get parameters
     params = module.params
+    device_id, device_ids, name, serial_number, token, page_size = map(params.get, _PARAM_KEYS)
+
+    try:
+        api_url = validate_api_url(params.get("api_url") or DEFAULT_API_URL)
+    except ValueError as e:
+        module.fail_json(msg=str(e))
 
     # Initialize results
     result = {"devices": []}
 
+    # Filters for device listings; device_only is only matched client-side
+    filter_params = {key: params[key] for key in _FILTER_KEYS if params.get(key)}
+
     try:
-        # Initialize SCM client
-        client = ScmClient(access_token=params.get("scm_access_token"))
+        # Initialize SCM client, reusing one already built for this token in this process
+        client = get_cached_client(api_url, token)
+        client.device.max_limit = page_size
+        cache_key = ("device", api_url, token_fingerprint(token))
 
         # Get a device by id
-        if params.get("id"):
+        if device_id:
             try:
-                device_obj = client.device.get(params.get("id"))
+                device_obj = client.device.get(device_id)
                 if device_obj:
-                    result["devices"] = [json.loads(device_obj.model_dump_json(exclude_unset=True))]
+                    result["devices"] = [device_obj.model_dump(mode="json", exclude_unset=True)]
             except ObjectNotPresentError as e:
                 module.fail_json(msg=f"Failed to retrieve device info: {e}")
 
+        # Get several devices by id concurrently, preserving the requested order
+        elif device_ids:
+            with ThreadPoolExecutor(max_workers=min(8, len(device_ids))) as executor:
+                devices = executor.map(lambda i: _get_or_none(client, i), device_ids)
+                result["devices"] = [d.model_dump(mode="json", exclude_unset=True) for d in devices if d is not None]
+
         # Fetch a device by name (using display_name to match)
-        elif params.get("name"):
+        elif name:
             try:
-                # First get all devices
-                response = client.device.list()
-                devices = response.data if hasattr(response, "data") else response
+                # display_name has no server-side filter, so narrow the listing with any model/type
+                # filters first and match the name on the smaller result
+                index = _devices_by_display_name(client, cache_key, **filter_params)
 
-                # Filter devices where display_name matches the provided name
-                matching_devices = [d for d in devices if getattr(d, "display_name", "") == params.get("name")]
+                # Devices whose display_name matches the provided name
+                matching_devices = index.get(name)
 
                 if matching_devices:
-                    # Convert to JSON-serializable dict
-                    result["devices"] = [json.loads(d.model_dump_json(exclude_unset=True)) for d in matching_devices]
+                    result["devices"] = matching_devices
                 else:
-                    module.fail_json(msg=f"No devices found with display_name: {params.get('name')}")
+                    module.fail_json(msg=f"No devices found with display_name: {name}")
             except Exception as e:
                 module.fail_json(msg=f"Failed to retrieve device info: {e}")
 
         # Fetch a device by serial number
-        elif params.get("serial_number"):
+        elif serial_number:
             try:
-                # The API treats serial_number as a unique identifier similar to name
-                device = client.device.fetch(name=params.get("serial_number"))
-                if device:
-                    result["devices"] = [json.loads(device.model_dump_json(exclude_unset=True))]
+                # Let the API filter by serial number rather than listing every device
+                result["devices"] = _list_devices(client, cache_key, serial_number=serial_number)
             except ObjectNotPresentError as e:
                 module.fail_json(msg=f"Failed to retrieve device info: {e}")
 
         else:
-            # Prepare filter parameters for the SDK
-            filter_params = {}
-            if params.get("model"):
-                filter_params["model"] = params.get("model")
-            if params.get("type"):
-                filter_params["type"] = params.get("type")
-            if params.get("device_only"):
-                filter_params["device_only"] = params.get("device_only")
-
-            # List devices with filters
-            response = client.device.list(**filter_params) if filter_params else client.device.list()
-
-            # Check if response has expected structure (with data field)
-            if hasattr(response, "data"):
-                # Access the data field that contains the list of devices
-                devices = response.data
-                # Convert to a list of dicts
-                device_dicts = [json.loads(d.model_dump_json(exclude_unset=True)) for d in devices]
-                # Add pagination metadata if available
-                if hasattr(response, "limit"):
-                    result["limit"] = response.limit
-                if hasattr(response, "offset"):
-                    result["offset"] = response.offset
-                if hasattr(response, "total"):
-                    result["total"] = response.total
-            else:
-                # Fallback for direct device list (older API versions or different endpoints)
-                device_dicts = [json.loads(d.model_dump_json(exclude_unset=True)) for d in response]
-
-            # Add to results
-            result["devices"] = device_dicts
+            # List devices with filters, converting each page as it arrives
+            result["devices"] = _list_devices(client, cache_key, **filter_params)
+
+        # Project onto the requested fields; cached device dicts are shared, so build new ones
+        fields = params.get("fields")
+        if fields:
+            result["devices"] = [{key: d[key] for key in fields if key in d} for d in result["devices"]]
 
         # Return results
         module.exit_json(**result)
@@ -3,12 +3,9 @@
 # Copyright: (c) 2025, Calvin Remsburg (@cdot65) <dev@cdot.io>
 # GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
-import json
-
 from ansible.module_utils.basic import AnsibleModule
-from scm.client import Scm as ScmClient
-from scm.exceptions import APIError, ObjectNotPresentError
-from scm.models.security import DNSSecurityProfileCreateModel
+from ansible_collections.cdot65.scm.plugins.module_utils.connection import DEFAULT_API_URL, get_cached_client, validate_api_url
+from ansible_collections.cdot65.scm.plugins.module_utils.serialization import use_fast_json
 
 DOCUMENTATION = r"""
 ---
@@ -127,14 +124,24 @@ def main():
         supports_check_mode=True,
         mutually_exclusive=[["folder", "snippet", "device"]],
     )
+    use_fast_json(module)
+
+    try:
+        from scm.exceptions import APIError, NotFoundError, ObjectNotPresentError
+    except ImportError:
+        module.fail_json(msg="pan-scm-sdk required")
 
     result = {"changed": False, "msg": "", "dns_security_profile": {}}
     params = module.params
     state = params["state"]
-    api_url = params.get("api_url") or "https://api.strata.paloaltonetworks.com"
+    try:
+        api_url = validate_api_url(params.get("api_url") or DEFAULT_API_URL)
+    except ValueError as e:
+        module.fail_json(msg=str(e))
 
+    # Reuse the client, and its pooled keep-alive session, already built for this token in this process
     try:
-        client = ScmClient(access_token=params["scm_access_token"], api_base_url=api_url)
+        client = get_cached_client(api_url, params["scm_access_token"])
     except Exception as e:
         module.fail_json(msg=f"Failed to initialize SCM client: {e!s}")
 
@@ -146,10 +153,22 @@ def main():
     profile_id = params.get("id")
     profile_name = params.get("name")
 
+    if state == "absent" and profile_id and not module.check_mode:
+        # Deleting by id needs no lookup first; a 404 means the profile is already gone
+        try:
+            client.dns_security_profile.delete(profile_id)
+            result["changed"] = True
+            result["msg"] = f"DNS Security profile '{profile_name or profile_id}' deleted"
+        except NotFoundError:
+            result["msg"] = f"DNS Security profile '{profile_name or profile_id}' not found"
+        except APIError as e:
+            module.fail_json(msg=f"Failed to delete profile: {e!s}")
+        module.exit_json(**result)
+
     if profile_id:
         try:
-            existing_profile = client.dns_security_profile.fetch(profile_id)
-        except ObjectNotPresentError:
+            existing_profile = client.dns_security_profile.get(profile_id)
+        except NotFoundError:
             pass
         except APIError as e:
             module.fail_json(msg=f"Failed to fetch profile by ID: {e!s}")
@@ -183,22 +202,28 @@ def main():
     if params.get("botnet_domains"):
         profile_data["botnet_domains"] = params["botnet_domains"]
 
-    try:
-        DNSSecurityProfileCreateModel(**profile_data)
-    except Exception as e:
-        module.fail_json(msg=f"Failed to validate profile data: {e!s}")
+    # create() validates through the same SDK model, so only validate here when it will not run
+    if existing_profile or module.check_mode:
+        from scm.models.security import DNSSecurityProfileCreateModel
+
+        try:
+            DNSSecurityProfileCreateModel(**profile_data)
+        except Exception as e:
+            module.fail_json(msg=f"Failed to validate profile data: {e!s}")
 
     if existing_profile:
-        result["dns_security_profile"] = json.loads(existing_profile.model_dump_json())
+        result["dns_security_profile"] = existing_profile.model_dump(mode="json")
         result["msg"] = f"DNS Security profile '{profile_name}' exists (update not implemented)"
     else:
         if not module.check_mode:
             try:
                 created = client.dns_security_profile.create(profile_data)
-                result["dns_security_profile"] = json.loads(created.model_dump_json())
+                result["dns_security_profile"] = created.model_dump(mode="json")
                 result["msg"] = f"DNS Security profile '{profile_name}' created"
             except APIError as e:
                 module.fail_json(msg=f"Failed to create profile: {e!s}")
+            except ValueError as e:
+                module.fail_json(msg=f"Failed to validate profile data: {e!s}")
         result["changed"] = True
 
     module.exit_json(**result)
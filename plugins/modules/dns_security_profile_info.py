@@ -3,11 +3,12 @@
 # Copyright: (c) 2025, Calvin Remsburg (@cdot65) <dev@cdot.io>
 # GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
-import json
+import operator
+from concurrent.futures import ThreadPoolExecutor
 
 from ansible.module_utils.basic import AnsibleModule
-from scm.client import Scm as ScmClient
-from scm.exceptions import APIError, ObjectNotPresentError
+from ansible_collections.cdot65.scm.plugins.module_utils.connection import DEFAULT_API_URL, get_cached_client, validate_api_url
+from ansible_collections.cdot65.scm.plugins.module_utils.serialization import use_fast_json
 
 DOCUMENTATION = r"""
 ---
@@ -22,8 +23,18 @@ options:
     name:
         description:
             - Name of the DNS Security profile to retrieve.
+            - Mutually exclusive with I(names).
         type: str
         required: false
+    names:
+        description:
+            - Names of several DNS Security profiles to retrieve from the container.
+            - Lookups are issued concurrently, up to 8 at a time.
+            - Names that do not exist are skipped.
+            - Mutually exclusive with I(name).
+        type: list
+        elements: str
+        required: false
     folder:
         description:
             - The folder to search.
@@ -61,6 +72,14 @@ EXAMPLES = r"""
   cdot65.scm.dns_security_profile_info:
     folder: "Texas"
     scm_access_token: "{{ scm_access_token }}"
+
+- name: Get several DNS Security profiles by name
+  cdot65.scm.dns_security_profile_info:
+    names:
+      - "Best-Practice"
+      - "Strict-Sinkhole"
+    folder: "Texas"
+    scm_access_token: "{{ scm_access_token }}"
 """
 
 RETURN = r"""
@@ -71,54 +90,130 @@ dns_security_profiles:
 """
 
 
+_dump = operator.methodcaller("model_dump", mode="json")
+
+_CONTAINER_TYPES = ("folder", "snippet", "device")
+
+_MODULE_ARGS = dict(
+    name=dict(type="str", required=False),
+    names=dict(type="list", elements="str", required=False),
+    folder=dict(type="str", required=False),
+    snippet=dict(type="str", required=False),
+    device=dict(type="str", required=False),
+    id=dict(type="str", required=False),
+    scm_access_token=dict(type="str", required=True, no_log=True),
+    api_url=dict(type="str", required=False),
+)
+
+_MUTUALLY_EXCLUSIVE = [
+    list(_CONTAINER_TYPES),
+    ["name", "names"],
+]
+
+
+def _get_or_none(client, profile_id):
+    """Get one profile by id, returning None when it does not exist."""
+    from scm.exceptions import NotFoundError
+
+    try:
+        return client.dns_security_profile.get(profile_id)
+    except NotFoundError:
+        return None
+
+
+def _fetch_or_none(client, name, container):
+    """Fetch one profile by name, returning None when it does not exist."""
+    from scm.exceptions import ObjectNotPresentError
+
+    try:
+        return client.dns_security_profile.fetch(name=name, **container)
+    except ObjectNotPresentError:
+        return None
+
+
+def _handle_by_id(client, params, container):
+    """Return the profile with the requested id, if it exists."""
+    profile = _get_or_none(client, params["id"])
+    return [] if profile is None else [_dump(profile)]
+
+
+def _handle_by_name(client, params, container):
+    """Return the profile with the requested name in the container, if it exists."""
+    profile = _fetch_or_none(client, params["name"], container)
+    return [] if profile is None else [_dump(profile)]
+
+
+def _handle_names(client, params, container):
+    """Return the requested profiles that exist, fetched concurrently in the requested order."""
+    names = params["names"]
+    with ThreadPoolExecutor(max_workers=min(8, len(names))) as executor:
+        profiles = executor.map(lambda n: _fetch_or_none(client, n, container), names)
+        return [
+            _dump(profile) for requested, profile in zip(names, profiles) if profile is not None and profile.name == requested
+        ]
+
+
+def _handle_list(client, params, container):
+    """Return every profile in the container."""
+    return list(map(_dump, client.dns_security_profile.list(**container)))
+
+
+def _pick_handler(params, container):
+    """Return the handler for the query shape given by the parameters, or None when it is incomplete."""
+    if params.get("id"):
+        return _handle_by_id
+    if not container:
+        return None
+    if params.get("name"):
+        return _handle_by_name
+    if params.get("names"):
+        return _handle_names
+    return _handle_list
+
+
 def main():
     """Main module execution."""
     module = AnsibleModule(
-        argument_spec=dict(
-            name=dict(type="str", required=False),
-            folder=dict(type="str", required=False),
-            snippet=dict(type="str", required=False),
-            device=dict(type="str", required=False),
-            id=dict(type="str", required=False),
-            scm_access_token=dict(type="str", required=True, no_log=True),
-            api_url=dict(type="str", required=False),
-        ),
+        argument_spec=_MODULE_ARGS,
         supports_check_mode=True,
-        mutually_exclusive=[["folder", "snippet", "device"]],
+        mutually_exclusive=_MUTUALLY_EXCLUSIVE,
     )
+    use_fast_json(module)
+
+    try:
+        from scm.exceptions import APIError
+    except ImportError:
+        module.fail_json(msg="pan-scm-sdk required")
 
     result = {"changed": False, "dns_security_profiles": []}
     params = module.params
-    api_url = params.get("api_url") or "https://api.strata.paloaltonetworks.com"
+    try:
+        api_url = validate_api_url(params.get("api_url") or DEFAULT_API_URL)
+    except ValueError as e:
+        module.fail_json(msg=str(e))
+
+    container_type = next((ct for ct in _CONTAINER_TYPES if params.get(ct)), None)
+    container = {container_type: params[container_type]} if container_type else {}
 
+    # Pick the query once, before any client work
+    handler = _pick_handler(params, container)
+    if handler is None:
+        module.fail_json(msg="Provide id, name with container, or container")
+
+    # Reuse the client, and its pooled keep-alive session, already built for this token in this process
     try:
-        client = ScmClient(access_token=params["scm_access_token"], api_base_url=api_url)
+        client = get_cached_client(api_url, params["scm_access_token"])
     except Exception as e:
         module.fail_json(msg=f"Failed to initialize SCM client: {e!s}")
 
-    container_type = next((ct for ct in ["folder", "snippet", "device"] if params.get(ct)), None)
-    container_name = params.get(container_type) if container_type else None
-
     try:
-        if params.get("id"):
-            try:
-                profile = client.dns_security_profile.fetch(params["id"])
-                result["dns_security_profiles"] = [json.loads(profile.model_dump_json())]
-            except ObjectNotPresentError:
-                pass
-        elif params.get("name") and container_type:
-            try:
-                profile = client.dns_security_profile.fetch(name=params["name"], **{container_type: container_name})
-                result["dns_security_profiles"] = [json.loads(profile.model_dump_json())]
-            except ObjectNotPresentError:
-                pass
-        elif container_type:
-            profiles = client.dns_security_profile.list(**{container_type: container_name})
-            result["dns_security_profiles"] = [json.loads(p.model_dump_json()) for p in profiles]
-        else:
-            module.fail_json(msg="Provide id, name with container, or container")
+        result["dns_security_profiles"] = handler(client, params, container)
     except APIError as e:
-        module.fail_json(msg=f"Failed to retrieve profiles: {e!s}")
+        module.fail_json(
+            msg=f"Failed to retrieve profiles: {e!s}",
+            error_code=getattr(e, "error_code", None),
+            details=getattr(e, "details", None),
+        )
 
     module.exit_json(**result)
 
@@ -3,12 +3,16 @@
 # Copyright: (c) 2025, Calvin Remsburg (@cdot65) <dev@cdot.io>
 # GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
-import json
-
 from ansible.module_utils.basic import AnsibleModule
-from scm.client import ScmClient
-from scm.exceptions import APIError, InvalidObjectError, ObjectNotPresentError
-from scm.models.objects import DynamicUserGroupCreateModel
+from ansible_collections.cdot65.scm.plugins.module_utils.connection import (
+    DEFAULT_API_URL,
+    cached_read,
+    get_cached_client,
+    invalidate_read,
+    token_fingerprint,
+    validate_api_url,
+)
+from ansible_collections.cdot65.scm.plugins.module_utils.serialization import use_fast_json
 
 DOCUMENTATION = r"""
 ---
@@ -203,50 +207,138 @@ dynamic_user_group:
 """
 
 
-def main():
-    module_args = dict(
-        name=dict(type="str", required=False),
-        description=dict(type="str", required=False),
-        tag=dict(type="list", elements="str", required=False),
-        filter=dict(type="str", required=False),
-        folder=dict(type="str", required=False),
-        snippet=dict(type="str", required=False),
-        device=dict(type="str", required=False),
-        id=dict(type="str", required=False),
-        scm_access_token=dict(type="str", required=True, no_log=True),
-        api_url=dict(type="str", required=False),
-        state=dict(type="str", required=False, choices=["present", "absent"], default="present"),
+_CONTAINER_TYPES = ("folder", "snippet", "device")
+_UPDATE_KEYS = ("description", "tag", "filter")
+_CREATE_KEYS = ("name", *_UPDATE_KEYS, *_CONTAINER_TYPES)
+
+_MODULE_ARGS = dict(
+    name=dict(type="str", required=False),
+    description=dict(type="str", required=False),
+    tag=dict(type="list", elements="str", required=False),
+    filter=dict(type="str", required=False),
+    folder=dict(type="str", required=False),
+    snippet=dict(type="str", required=False),
+    device=dict(type="str", required=False),
+    id=dict(type="str", required=False),
+    scm_access_token=dict(type="str", required=True, no_log=True),
+    api_url=dict(type="str", required=False),
+    state=dict(type="str", required=False, choices=["present", "absent"], default="present"),
+)
+
+_REQUIRED_IF = [
+    ["state", "present", ["name", "filter"]],  # Both name and filter required for present
+    ["state", "absent", ["name", "id"], True],  # At least one of name or id required
+]
+
+_MUTUALLY_EXCLUSIVE = [
+    list(_CONTAINER_TYPES),
+]
+
+
+def _pick_container(params):
+    """Return the (type, name) of the container set in the module parameters.
+
+    Args:
+        params: Module parameters
+
+    Returns:
+        tuple: Container type and name, or (None, None) when none is set
+    """
+    for container_type in _CONTAINER_TYPES:
+        container_name = params.get(container_type)
+        if container_name:
+            return container_type, container_name
+    return None, None
+
+
+def _groups_by_name(client, cache_key, container):
+    """Return the dynamic user groups of one container keyed by name.
+
+    One list call per container replaces a fetch per group, and the result is
+    shared by tasks running in the same process for the same container.
+
+    Args:
+        client: SCM client
+        cache_key: Key for the shared read cache
+        container: Container keyword, e.g. {"folder": "Texas"}
+
+    Returns:
+        dict: Dynamic user group models keyed by name
+    """
+    return cached_read(
+        cache_key,
+        lambda: {g.name: g for g in client.dynamic_user_group.list(exact_match=True, **container)},
     )
 
+
+def _find_group(client, cache_key, container, name):
+    """Return the named dynamic user group visible from a container, or None.
+
+    The container's own groups come from the cached listing. A name missing
+    there is resolved with fetch(), which also finds groups the container
+    inherits from a parent folder, as the lookup did before the listing cache.
+
+    Args:
+        client: SCM client
+        cache_key: Key for the shared read cache
+        container: Container keyword, e.g. {"folder": "Texas"}
+        name: Dynamic user group name
+
+    Returns:
+        DynamicUserGroupResponseModel: The group, or None when it does not exist
+    """
+    from scm.exceptions import NotFoundError
+
+    group = _groups_by_name(client, cache_key, container).get(name)
+    if group is None:
+        try:
+            group = client.dynamic_user_group.fetch(name=name, **container)
+        except NotFoundError:
+            return None
+    return group
+
+
+def main():
     # Initialize module
     module = AnsibleModule(
-        argument_spec=module_args,
-        required_if=[
-            ["state", "present", ["name", "filter"]],  # Both name and filter required for present
-            ["state", "absent", ["name", "id"], True],  # At least one of name or id required
-        ],
-        mutually_exclusive=[
-            ["folder", "snippet", "device"],
-        ],
+        argument_spec=_MODULE_ARGS,
+        required_if=_REQUIRED_IF,
+        mutually_exclusive=_MUTUALLY_EXCLUSIVE,
         supports_check_mode=True,
     )
+    use_fast_json(module)
+
+    try:
+        from scm.exceptions import APIError, InvalidObjectError, NotFoundError, ObjectNotPresentError
+    except ImportError:
+        module.fail_json(msg="pan-scm-sdk required")
 
     # Get parameters
     params = module.params
+    container_type, container_name = _pick_container(params)
 
-    # Custom validation for container parameters
-    if params.get("state") == "present":
-        # For creation/update, one of the container types is required
-        if not any(params.get(container_type) for container_type in ["folder", "snippet", "device"]):
-            module.fail_json(msg="When state=present, one of the following is required: folder, snippet, device")
+    # For creation/update exactly one container is required; mutually_exclusive already rejects more than one
+    if container_type is None and params.get("state") == "present":
+        module.fail_json(msg="When state=present, one of the following is required: folder, snippet, device")
+
+    try:
+        api_url = validate_api_url(params.get("api_url") or DEFAULT_API_URL)
+    except ValueError as e:
+        module.fail_json(msg=str(e))
 
     # Initialize results
     result = {"changed": False, "dynamic_user_group": None}
 
     # Perform operations
     try:
-        # Initialize SCM client
-        client = ScmClient(access_token=params.get("scm_access_token"))
+        # Initialize SCM client, reusing one already built for this token in this process
+        client = get_cached_client(api_url, params.get("scm_access_token"))
+
+        # Read-cache key of the container listing, when a container is given
+        list_key = None
+        if container_type:
+            fingerprint = token_fingerprint(params.get("scm_access_token"))
+            list_key = ("dynamic_user_group", api_url, fingerprint, container_type, container_name)
 
         # Initialize dynamic_user_group_exists boolean
         dynamic_user_group_exists = False
@@ -255,46 +347,38 @@ def main():
         # Fetch a dynamic user group by name
         if params.get("name"):
             try:
-                # Handle different container types (folder, snippet, device)
-                container_type = None
-                container_name = None
-
-                if params.get("folder"):
-                    container_type = "folder"
-                    container_name = params.get("folder")
-                elif params.get("snippet"):
-                    container_type = "snippet"
-                    container_name = params.get("snippet")
-                elif params.get("device"):
-                    container_type = "device"
-                    container_name = params.get("device")
-
-                # For any container type, fetch the dynamic user group object
-                if container_type and container_name:
-                    dynamic_user_group_obj = client.dynamic_user_group.fetch(
-                        name=params.get("name"), **{container_type: container_name}
-                    )
+                # For any container type, look the dynamic user group up in the container's listing,
+                # falling back to the server for groups inherited from a parent folder
+                if list_key:
+                    dynamic_user_group_obj = _find_group(client, list_key, {container_type: container_name}, params.get("name"))
                     if dynamic_user_group_obj:
                         dynamic_user_group_exists = True
             except ObjectNotPresentError:
                 dynamic_user_group_exists = False
                 dynamic_user_group_obj = None
 
+        # Delete by id without a lookup first; a 404 means the group is already gone
+        if params.get("state") == "absent" and params.get("id") and not params.get("name"):
+            try:
+                if module.check_mode:
+                    client.dynamic_user_group.get(params["id"])
+                else:
+                    client.dynamic_user_group.delete(params["id"])
+                    if list_key:
+                        invalidate_read(list_key)
+                result["changed"] = True
+            except NotFoundError:
+                pass
+
         # Create or update or delete a dynamic_user_group
-        if params.get("state") == "present":
+        elif params.get("state") == "present":
             if dynamic_user_group_exists:
-                # Determine which fields differ and need to be updated
+                # Determine which fields differ and need to be updated; only the active container is compared
+                existing = dynamic_user_group_obj.model_dump()
                 update_fields = {
                     k: params[k]
-                    for k in [
-                        "description",
-                        "tag",
-                        "filter",
-                        "folder",
-                        "snippet",
-                        "device",
-                    ]
-                    if params[k] is not None and getattr(dynamic_user_group_obj, k, None) != params[k]
+                    for k in (*_UPDATE_KEYS, container_type)
+                    if params[k] is not None and existing.get(k) != params[k]
                 }
 
                 # Update the dynamic user group if needed
@@ -302,67 +386,44 @@ def main():
                     if not module.check_mode:
                         update_model = dynamic_user_group_obj.model_copy(update=update_fields)
                         updated = client.dynamic_user_group.update(update_model)
-                        result["dynamic_user_group"] = json.loads(updated.model_dump_json(exclude_unset=True))
+                        invalidate_read(list_key)
+                        result["dynamic_user_group"] = updated.model_dump(mode="json", exclude_unset=True)
                     else:
-                        result["dynamic_user_group"] = json.loads(dynamic_user_group_obj.model_dump_json(exclude_unset=True))
+                        result["dynamic_user_group"] = dynamic_user_group_obj.model_dump(mode="json", exclude_unset=True)
                     result["changed"] = True
-                    module.exit_json(**result)
                 else:
                     # No update needed
-                    result["dynamic_user_group"] = json.loads(dynamic_user_group_obj.model_dump_json(exclude_unset=True))
-                    result["changed"] = False
-                    module.exit_json(**result)
+                    result["dynamic_user_group"] = dynamic_user_group_obj.model_dump(mode="json", exclude_unset=True)
 
             else:
                 # Create a payload for a new dynamic user group object
-                create_payload = {
-                    k: params[k]
-                    for k in [
-                        "name",
-                        "description",
-                        "tag",
-                        "filter",
-                        "folder",
-                        "snippet",
-                        "device",
-                    ]
-                    if params.get(k) is not None
-                }
+                create_payload = {k: v for k in _CREATE_KEYS if (v := params.get(k)) is not None}
 
                 # Create a dynamic user group object
                 if not module.check_mode:
                     # Create a dynamic user group object
                     created = client.dynamic_user_group.create(create_payload)
+                    invalidate_read(list_key)
 
                     # Return the created dynamic user group object
-                    result["dynamic_user_group"] = json.loads(created.model_dump_json(exclude_unset=True))
+                    result["dynamic_user_group"] = created.model_dump(mode="json", exclude_unset=True)
                 else:
-                    # Simulate a created dynamic user group object (minimal info)
-                    simulated = DynamicUserGroupCreateModel(**create_payload)
-                    result["dynamic_user_group"] = simulated.model_dump(exclude_unset=True)
+                    # Simulate a created dynamic user group object by echoing the payload; no API call is made
+                    result["dynamic_user_group"] = dict(create_payload)
 
                 # Mark as changed
                 result["changed"] = True
 
-                # Exit
-                module.exit_json(**result)
-
         # Delete a dynamic user group object
         elif params.get("state") == "absent":
             if dynamic_user_group_exists:
                 if not module.check_mode:
                     client.dynamic_user_group.delete(dynamic_user_group_obj.id)
+                    invalidate_read(list_key)
 
                 # Mark as changed
                 result["changed"] = True
-
-                # Exit
-                result["dynamic_user_group"] = json.loads(dynamic_user_group_obj.model_dump_json(exclude_unset=True))
-                module.exit_json(**result)
-            else:
-                # Already absent
-                result["changed"] = False
-                module.exit_json(**result)
+                result["dynamic_user_group"] = dynamic_user_group_obj.model_dump(mode="json", exclude_unset=True)
 
     # Handle errors
     except (ObjectNotPresentError, InvalidObjectError) as e:
@@ -374,6 +435,9 @@ def main():
     except Exception as e:
         module.fail_json(msg="Unexpected error: " + str(e))
 
+    # Every branch above only fills in the result; exit once here
+    module.exit_json(**result)
+
 
 if __name__ == "__main__":
     main()
@@ -3,11 +3,19 @@
 # Copyright: (c) 2025, Calvin Remsburg (@cdot65) <dev@cdot.io>
 # GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
-import json
+import functools
+import operator
 
 from ansible.module_utils.basic import AnsibleModule
-from scm.client import ScmClient
-from scm.exceptions import APIError, InvalidObjectError, ObjectNotPresentError
+from ansible_collections.cdot65.scm.plugins.module_utils.connection import (
+    DEFAULT_API_URL,
+    cached_read,
+    get_cached_client,
+    token_fingerprint,
+    validate_api_url,
+)
+from ansible_collections.cdot65.scm.plugins.module_utils.paging import iter_pages
+from ansible_collections.cdot65.scm.plugins.module_utils.serialization import use_fast_json
 
 DOCUMENTATION = r"""
 ---
@@ -194,121 +202,153 @@ dynamic_user_groups:
 """
 
 
-def main():
-    # Define the module argument specification
-    module_args = dict(
-        name=dict(type="str", required=False),
-        id=dict(type="str", required=False),
-        filters=dict(type="list", elements="str", required=False),
-        tags=dict(type="list", elements="str", required=False),
-        folder=dict(type="str", required=False),
-        snippet=dict(type="str", required=False),
-        device=dict(type="str", required=False),
-        exact_match=dict(type="bool", required=False, default=False),
-        scm_access_token=dict(type="str", required=True, no_log=True),
-        api_url=dict(type="str", required=False),
+_dump = operator.methodcaller("model_dump", exclude_unset=True, mode="json")
+
+_CONTAINER_TYPES = ("folder", "snippet", "device")
+
+_MODULE_ARGS = dict(
+    name=dict(type="str", required=False),
+    id=dict(type="str", required=False),
+    filters=dict(type="list", elements="str", required=False),
+    tags=dict(type="list", elements="str", required=False),
+    folder=dict(type="str", required=False),
+    snippet=dict(type="str", required=False),
+    device=dict(type="str", required=False),
+    exact_match=dict(type="bool", required=False, default=False),
+    scm_access_token=dict(type="str", required=True, no_log=True),
+    api_url=dict(type="str", required=False),
+)
+
+_MUTUALLY_EXCLUSIVE = [
+    ["id", "name"],
+    list(_CONTAINER_TYPES),
+]
+
+# Parameters unpacked into locals at the top of main()
+_PARAM_KEYS = ("id", "name", "filters", "tags", "exact_match")
+
+
+def _groups_by_name(client, cache_key, container):
+    """Return the dynamic user groups of one container keyed by name.
+
+    Uses the same cache key as the dynamic_user_group module, so lookups of
+    many names in one container, and writes that invalidate it, share a single
+    list call per process.
+
+    Args:
+        client: SCM client
+        cache_key: Key for the shared read cache
+        container: Container keyword, e.g. {"folder": "Texas"}
+
+    Returns:
+        dict: Dynamic user group models keyed by name
+    """
+    return cached_read(
+        cache_key,
+        lambda: {g.name: g for g in client.dynamic_user_group.list(exact_match=True, **container)},
     )
 
+
+@functools.lru_cache(maxsize=1)
+def _group_list_adapter():
+    """Build the pydantic adapter that validates and dumps a whole page of groups in one call."""
+    from pydantic import TypeAdapter
+    from scm.models.objects import DynamicUserGroupResponseModel
+
+    return TypeAdapter(list[DynamicUserGroupResponseModel])
+
+
+def _group_matches(group, tags, filters):
+    """Return whether a group passes the tags and filters options, matched the way the SDK's list() does."""
+    if tags and not (group.tag and any(tag in group.tag for tag in tags)):
+        return False
+    return not filters or any(value in group.filter for value in filters)
+
+
+def main():
     # Create the module
     module = AnsibleModule(
-        argument_spec=module_args,
-        mutually_exclusive=[
-            ["id", "name"],
-            ["folder", "snippet", "device"],
-        ],
+        argument_spec=_MODULE_ARGS,
+        mutually_exclusive=_MUTUALLY_EXCLUSIVE,
         supports_check_mode=True,
     )
+    use_fast_json(module)
+
+    try:
+        from pydantic import ValidationError
+        from scm.exceptions import APIError, InvalidObjectError, ObjectNotPresentError
+    except ImportError:
+        module.fail_json(msg="pan-scm-sdk required")
 
     # Get parameters
     params = module.params
+    group_id, group_name, filters, tags, exact_match = map(params.get, _PARAM_KEYS)
+    container_type, container_name = next(((c, params[c]) for c in _CONTAINER_TYPES if params.get(c)), (None, None))
+
+    try:
+        api_url = validate_api_url(params.get("api_url") or DEFAULT_API_URL)
+    except ValueError as e:
+        module.fail_json(msg=str(e))
 
     result = {"dynamic_user_groups": []}
 
     try:
-        # Initialize SCM client
-        client = ScmClient(access_token=params.get("scm_access_token"))
+        # Initialize SCM client, reusing one already built for this token in this process
+        client = get_cached_client(api_url, params.get("scm_access_token"))
 
         # Get a dynamic user group by ID if specified
-        if params.get("id"):
+        if group_id:
             try:
-                dynamic_user_group_obj = client.dynamic_user_group.get(params.get("id"))
+                dynamic_user_group_obj = client.dynamic_user_group.get(group_id)
                 if dynamic_user_group_obj:
-                    result["dynamic_user_groups"] = [json.loads(dynamic_user_group_obj.model_dump_json(exclude_unset=True))]
+                    result["dynamic_user_groups"] = [_dump(dynamic_user_group_obj)]
             except ObjectNotPresentError as e:
                 module.fail_json(msg=f"Failed to retrieve dynamic user group info: {e}")
         # Fetch a dynamic user group by name
-        elif params.get("name"):
-            try:
-                # Handle different container types (folder, snippet, device)
-                container_type = None
-                container_name = None
-
-                if params.get("folder"):
-                    container_type = "folder"
-                    container_name = params.get("folder")
-                elif params.get("snippet"):
-                    container_type = "snippet"
-                    container_name = params.get("snippet")
-                elif params.get("device"):
-                    container_type = "device"
-                    container_name = params.get("device")
-
-                # We need a container for the fetch operation
-                if not container_type or not container_name:
-                    module.fail_json(
-                        msg="When retrieving a dynamic user group by name, one of 'folder', 'snippet', or 'device' parameter is required"
-                    )
-
-                # For any container type, fetch the dynamic user group object
-                dynamic_user_group_obj = client.dynamic_user_group.fetch(
-                    name=params.get("name"), **{container_type: container_name}
+        elif group_name:
+            # We need a container for the lookup
+            if not container_type:
+                module.fail_json(
+                    msg="When retrieving a dynamic user group by name, one of 'folder', 'snippet', or 'device' parameter is required"
                 )
-                if dynamic_user_group_obj:
-                    result["dynamic_user_groups"] = [json.loads(dynamic_user_group_obj.model_dump_json(exclude_unset=True))]
-            except ObjectNotPresentError as e:
-                module.fail_json(msg=f"Failed to retrieve dynamic user group info: {e}")
+
+            # Look the name up in the container's listing, fetched once and shared across tasks in this process
+            container = {container_type: container_name}
+            list_key = (
+                "dynamic_user_group",
+                api_url,
+                token_fingerprint(params.get("scm_access_token")),
+                container_type,
+                container_name,
+            )
+            dynamic_user_group_obj = _groups_by_name(client, list_key, container).get(group_name)
+            if dynamic_user_group_obj is None:
+                # Groups inherited from a parent folder are not in the exact-match listing; resolve the name on the server
+                try:
+                    dynamic_user_group_obj = client.dynamic_user_group.fetch(name=group_name, **container)
+                except ObjectNotPresentError as e:
+                    module.fail_json(msg=f"Failed to retrieve dynamic user group info: {e}")
+            result["dynamic_user_groups"] = [_dump(dynamic_user_group_obj)]
 
         else:
-            # Prepare filter parameters for the SDK
-            filter_params = {}
-
-            # Add container filters (folder, snippet, device) - at least one is required
-            if params.get("folder"):
-                filter_params["folder"] = params.get("folder")
-            elif params.get("snippet"):
-                filter_params["snippet"] = params.get("snippet")
-            elif params.get("device"):
-                filter_params["device"] = params.get("device")
-            else:
+            # A container (folder, snippet, device) is required for listing
+            if not container_type:
                 module.fail_json(
                     msg="At least one container parameter (folder, snippet, or device) is required for listing dynamic user groups"
                 )
-
-            # Add exact_match parameter if specified
-            if params.get("exact_match"):
-                filter_params["exact_match"] = params.get("exact_match")
-
-            # List dynamic user groups with container filters
-            dynamic_user_groups = client.dynamic_user_group.list(**filter_params)
-
-            # Apply additional client-side filtering
-            if params.get("filters") or params.get("tags"):
-                additional_filters = {}
-
-                if params.get("filters"):
-                    additional_filters["filters"] = params.get("filters")
-
-                if params.get("tags"):
-                    additional_filters["tags"] = params.get("tags")
-
-                # Apply client-side filtering
-                dynamic_user_groups = client.dynamic_user_group._apply_filters(dynamic_user_groups, additional_filters)
-
-            # Convert to a list of dicts
-            dynamic_user_group_dicts = [json.loads(g.model_dump_json(exclude_unset=True)) for g in dynamic_user_groups]
-
-            # Add to results
-            result["dynamic_user_groups"] = dynamic_user_group_dicts
+            container = {container_type: container_name}
+
+            # Validate, filter and dump one API page at a time, so the whole listing is never held as models
+            adapter = _group_list_adapter()
+            groups = result["dynamic_user_groups"]
+            for page in iter_pages(client, client.dynamic_user_group, container):
+                matching = [
+                    group
+                    for group in adapter.validate_python(page)
+                    if _group_matches(group, tags, filters)
+                    and (not exact_match or getattr(group, container_type) == container_name)
+                ]
+                groups.extend(adapter.dump_python(matching, mode="json", exclude_unset=True))
 
         module.exit_json(**result)
     except (InvalidObjectError, APIError) as e:
@@ -317,6 +357,8 @@ def main():
             error_code=getattr(e, "error_code", None),
             details=getattr(e, "details", None),
         )
+    except ValidationError as e:
+        module.fail_json(msg=f"Invalid dynamic user group data in API response: {e}")
     except Exception as e:
         module.fail_json(msg=f"Failed to retrieve dynamic user group info: {e}")
 
@@ -0,0 +1,35 @@
+# Copyright: (c) 2025, Calvin Remsburg (@cdot65) <dev@cdot.io>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Unit tests for the bandwidth_allocation module."""
+
+import pytest
+from ansible_collections.cdot65.scm.plugins.modules.bandwidth_allocation import _spns_differ
+
+
+@pytest.mark.parametrize(
+    "desired, current",
+    [
+        (["spn-a", "spn-b"], ["spn-b", "spn-a"]),
+        (["spn-a", "spn-a", "spn-b"], ["spn-a", "spn-b", "spn-b"]),
+        (["spn-a", "spn-b"], ["spn-a", "spn-a", "spn-b"]),
+        (["spn-a", "spn-a"], ["spn-a"]),
+        (None, ["spn-a"]),
+        ([], None),
+    ],
+)
+def test_spns_equal_ignoring_order_and_duplicates(desired, current):
+    assert not _spns_differ(desired, current)
+
+
+@pytest.mark.parametrize(
+    "desired, current",
+    [
+        (["spn-a", "spn-b"], ["spn-a"]),
+        (["spn-a", "spn-a"], ["spn-a", "spn-b"]),
+        (["spn-a"], None),
+        (["spn-a"], []),
+    ],
+)
+def test_spns_differ(desired, current):
+    assert _spns_differ(desired, current)